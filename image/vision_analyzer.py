@@ -20,21 +20,33 @@ class VisionAnalyzer:
     descriptions, and colors.
     """
 
-    def __init__(self, model: str = "qwen2.5-vl:7b", save_processed: bool = True):
+    def __init__(
+        self,
+        model: str = "qwen2.5-vl:7b",
+        save_processed: bool = True,
+        session: Optional[requests.Session] = None,
+    ):
         """
         Initialize the VisionAnalyzer with specified model and settings.
 
         Args:
             model: Name of the Ollama vision model to use
             save_processed: Whether to save processed images (original, cropped, resized)
+            session: HTTP session to reuse for Ollama and image downloads
         """
         self.model = model
         self.save_processed = save_processed
         self.logger = logging.getLogger(__name__)
         self.ollama_host = os.getenv("OLLAMA_HOST", "http://localhost:11434")
+        # One pooled session keeps connections alive across calls
+        self.session = session or requests.Session()
 
         self.logger.debug(f"VisionAnalyzer initialized with model: {self.model}")
 
+    def close(self) -> None:
+        """Close the pooled HTTP session."""
+        self.session.close()
+
     def _call_ollama(self, prompt: str, image_data: str = None) -> str:
         """
         Call Ollama API with optional image data.
@@ -59,7 +71,7 @@ class VisionAnalyzer:
             if image_data:
                 payload["images"] = [image_data]
 
-            response = requests.post(url, json=payload, timeout=60)
+            response = self.session.post(url, json=payload, timeout=60)
             response.raise_for_status()
 
             return response.json().get("response", "")
@@ -178,10 +190,8 @@ class VisionAnalyzer:
         Returns:
             Base64 encoded image string
         """
-        import requests
-
         try:
-            response = requests.get(url)
+            response = self.session.get(url)
             response.raise_for_status()
             return self.encode_image(response.content)
         except Exception as e:
@@ -350,8 +360,10 @@ Examples: black, white, navy, denim-blue, forest-green, burgundy"""
 
         except Exception as e:
             self.logger.error(f"Error parsing JSON response: {str(e)}")
-            # Return fallback response that matches expected schema
+            # Return fallback response that matches expected schema, flagged so
+            # callers can tell it apart from a real analysis
             return {
+                "fallback": True,
                 "color": "black",
                 "category": "accessory",
                 "material": "polyester",
@@ -12,15 +12,40 @@ import structlog
 import aiohttp
 import asyncio
 import random
+import re
 
 from ..domain.entities import Category, Material, Pattern, Season, Occasion, Fit
 
 logger = structlog.get_logger()
 
+# Image key keywords -> MockVisionProvider.mock_data group, tried in order
+_KEY_PATTERNS = tuple(
+    (re.compile("|".join(map(re.escape, words))), group)
+    for words, group in (
+        (("tshirt", "t-shirt", "shirt", "blouse", "top"), "tshirt"),
+        (("jeans", "pants", "trousers", "bottom"), "jeans"),
+        (("dress", "gown"), "dress"),
+        (("jacket", "coat", "blazer", "cardigan"), "jacket"),
+        (("shoe", "sneaker", "boot", "heel"), "sneakers"),
+    )
+)
+_PLUS_SIZE_PATTERN = re.compile("plus|xl|xxl|3xl|large")
+
+# Enum values for the mock's randomized fallback
+_CATEGORY_VALUES = [category.value for category in Category]
+_MATERIAL_VALUES = [material.value for material in Material]
+_PATTERN_VALUES = [pattern.value for pattern in Pattern]
+_SEASON_VALUES = [season.value for season in Season]
+_OCCASION_VALUES = [occasion.value for occasion in Occasion]
+_FIT_VALUES = [fit.value for fit in Fit]
+
 
 class VisionProvider(ABC):
     """Abstract base class for vision providers."""
 
+    # Whether results already hold normalized, schema-valid attribute values
+    trusted_results: bool = False
+
     @abstractmethod
     async def analyze_image(self, image_key: str) -> Dict[str, Any]:
         """Analyze image and extract attributes."""
@@ -30,10 +55,29 @@ class VisionProvider(ABC):
 class VisionProviderOllama(VisionProvider):
     """Ollama-based vision provider that calls the vision sidecar."""
 
-    def __init__(self, sidecar_url: str, timeout: int = 40):
+    def __init__(
+        self,
+        sidecar_url: str,
+        timeout: int = 40,
+        session: Optional[aiohttp.ClientSession] = None,
+    ):
         self.sidecar_url = sidecar_url
         self.timeout = timeout
         self.logger = logger.bind(provider="vision_sidecar", url=sidecar_url)
+        # Shared across calls so connections to the sidecar are kept alive
+        self._session = session
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared HTTP session, opening it on first use."""
+        # Created lazily because aiohttp sessions must be opened inside a running loop
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+        return self._session
+
+    async def close(self) -> None:
+        """Close the shared HTTP session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
 
     async def analyze_image(self, image_key: str) -> Dict[str, Any]:
         """
@@ -49,22 +93,21 @@ class VisionProviderOllama(VisionProvider):
             self.logger.info("Analyzing image with vision sidecar", image_key=image_key)
 
             # Call vision sidecar
-            async with aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=self.timeout)
-            ) as session:
-                payload = {"image_key": image_key}
+            payload = {"image_key": image_key}
 
-                async with session.post(
-                    f"{self.sidecar_url}/analyze", json=payload
-                ) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        return result
-                    else:
-                        error_text = await response.text()
-                        raise Exception(
-                            f"Vision sidecar error: {response.status} - {error_text}"
-                        )
+            async with self._get_session().post(
+                f"{self.sidecar_url}/analyze",
+                json=payload,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            ) as response:
+                if response.status == 200:
+                    result = await response.json()
+                    return result
+                else:
+                    error_text = await response.text()
+                    raise Exception(
+                        f"Vision sidecar error: {response.status} - {error_text}"
+                    )
 
         except Exception as e:
             self.logger.error(
@@ -76,6 +119,9 @@ class VisionProviderOllama(VisionProvider):
 class MockVisionProvider(VisionProvider):
     """Mock vision provider for testing purposes with realistic fashion data."""
 
+    # Mock data is built from enum values and lowercase colors
+    trusted_results = True
+
     def __init__(self):
         self.logger = logger.bind(provider="mock_vision")
 
@@ -197,35 +243,22 @@ class MockVisionProvider(VisionProvider):
         key_lower = image_key.lower()
 
         # Match patterns to categories
-        if any(
-            word in key_lower
-            for word in ["tshirt", "t-shirt", "shirt", "blouse", "top"]
-        ):
-            category_data = self.mock_data.get("tshirt", [])
-        elif any(
-            word in key_lower for word in ["jeans", "pants", "trousers", "bottom"]
-        ):
-            category_data = self.mock_data.get("jeans", [])
-        elif any(word in key_lower for word in ["dress", "gown"]):
-            category_data = self.mock_data.get("dress", [])
-        elif any(
-            word in key_lower for word in ["jacket", "coat", "blazer", "cardigan"]
-        ):
-            category_data = self.mock_data.get("jacket", [])
-        elif any(word in key_lower for word in ["shoe", "sneaker", "boot", "heel"]):
-            category_data = self.mock_data.get("sneakers", [])
+        for pattern, group in _KEY_PATTERNS:
+            if pattern.search(key_lower):
+                category_data = self.mock_data.get(group, [])
+                break
         else:
             # Default fallback with variety
             fallback_options = [
                 {
                     "color": random.choice(["black", "white", "navy", "grey", "beige"]),
-                    "category": random.choice(list(Category)).value,
-                    "material": random.choice(list(Material)).value,
-                    "pattern": random.choice(list(Pattern)).value,
+                    "category": random.choice(_CATEGORY_VALUES),
+                    "material": random.choice(_MATERIAL_VALUES),
+                    "pattern": random.choice(_PATTERN_VALUES),
                     "style": "modern",
-                    "season": random.choice(list(Season)).value,
-                    "occasion": random.choice(list(Occasion)).value,
-                    "fit": random.choice(list(Fit)).value,
+                    "season": random.choice(_SEASON_VALUES),
+                    "occasion": random.choice(_OCCASION_VALUES),
+                    "fit": random.choice(_FIT_VALUES),
                     "plus_size": random.choice([True, False]),
                     "description": f"Stylish fashion item with modern design and quality construction.",
                 }
@@ -236,7 +269,7 @@ class MockVisionProvider(VisionProvider):
         if category_data:
             result = random.choice(category_data)
             # Add some variability for plus_size based on image key hints
-            if any(word in key_lower for word in ["plus", "xl", "xxl", "3xl", "large"]):
+            if _PLUS_SIZE_PATTERN.search(key_lower):
                 result = result.copy()
                 result["plus_size"] = True
                 result["description"] += " Available in plus sizes for comfortable fit."
@@ -12,6 +12,7 @@ import logging
 
 from ...services.vision_analysis_service import VisionAnalysisService
 from ...core.auth import get_current_admin_user
+from ...domain.entities import Category, Material, Pattern, Season, Occasion, Fit
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +21,16 @@ router = APIRouter(prefix="/admin/vision-analysis", tags=["Vision Analysis"])
 # Initialize service
 vision_service = VisionAnalysisService()
 
+# Enum catalog is static, so walk the enum members once at import time
+SUPPORTED_CATEGORIES = {
+    "categories": [{"value": cat.value, "name": cat.name} for cat in Category],
+    "materials": [{"value": mat.value, "name": mat.name} for mat in Material],
+    "patterns": [{"value": pat.value, "name": pat.name} for pat in Pattern],
+    "seasons": [{"value": sea.value, "name": sea.name} for sea in Season],
+    "occasions": [{"value": occ.value, "name": occ.name} for occ in Occasion],
+    "fits": [{"value": fit.value, "name": fit.name} for fit in Fit],
+}
+
 
 # Request/Response Models
 class BatchAnalysisRequest(BaseModel):
@@ -363,13 +374,4 @@ async def get_supported_categories():
     Returns:
         List of supported categories and their descriptions
     """
-    from ...domain.entities import Category, Material, Pattern, Season, Occasion, Fit
-
-    return {
-        "categories": [{"value": cat.value, "name": cat.name} for cat in Category],
-        "materials": [{"value": mat.value, "name": mat.name} for mat in Material],
-        "patterns": [{"value": pat.value, "name": pat.name} for pat in Pattern],
-        "seasons": [{"value": sea.value, "name": sea.name} for sea in Season],
-        "occasions": [{"value": occ.value, "name": occ.name} for occ in Occasion],
-        "fits": [{"value": fit.value, "name": fit.name} for fit in Fit],
-    }
+    return SUPPORTED_CATEGORIES
@@ -5,6 +5,7 @@ This module defines the core domain entities for the lookbook-MPC system.
 These entities represent the business objects and their relationships.
 """
 
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Dict, List, Optional, Any, Union
 from enum import Enum
@@ -268,38 +269,41 @@ class Outfit(BaseModel):
         json_encoders = {datetime: lambda v: v.isoformat() if v else None}
 
 
-class OutfitItem(BaseModel):
-    """Domain entity representing the relationship between outfits and items."""
+@dataclass(frozen=True, slots=True)
+class OutfitItem:
+    """Domain entity representing the relationship between outfits and items.
 
-    outfit_id: int = Field(..., ge=1, description="Foreign key to outfit")
-    item_id: int = Field(..., ge=1, description="Foreign key to item")
-    role: Role = Field(..., description="Role of item in outfit")
+    A plain value object rather than a pydantic model: it never crosses the
+    API boundary, and recommendation runs create many of them.
+    """
 
-    @validator("outfit_id")
-    def validate_outfit_id(cls, v):
-        if v < 1:
-            raise ValueError("outfit_id must be positive")
-        return v
+    outfit_id: int
+    item_id: int
+    role: Role
 
-    @validator("item_id")
-    def validate_item_id(cls, v):
-        if v < 1:
+    def __post_init__(self):
+        # Coerce ids like the pydantic models do, so "1" or 1.0 still work
+        for name in ("outfit_id", "item_id"):
+            object.__setattr__(self, name, self._as_id(name, getattr(self, name)))
+        if self.outfit_id < 1:
+            raise ValueError("outfit_id must be positive")
+        if self.item_id < 1:
             raise ValueError("item_id must be positive")
-        return v
-
-    @model_validator(mode="before")
-    @classmethod
-    def validate_relationship(cls, values):
-        outfit_id = values.get("outfit_id")
-        item_id = values.get("item_id")
-        if outfit_id and item_id:
-            # Basic validation - in real app might check if relationship exists
-            if outfit_id == item_id:
-                raise ValueError("outfit_id and item_id cannot be the same")
-        return values
-
-    class Config:
-        use_enum_values = True
+        # Basic validation - in real app might check if relationship exists
+        if self.outfit_id == self.item_id:
+            raise ValueError("outfit_id and item_id cannot be the same")
+        # Store the plain value, matching use_enum_values on the pydantic models
+        object.__setattr__(self, "role", Role(self.role).value)
+
+    @staticmethod
+    def _as_id(name: str, value: Any) -> int:
+        """Return value as an int id, raising ValueError if it is not one."""
+        if isinstance(value, float) and not value.is_integer():
+            raise ValueError(f"{name} must be an integer")
+        try:
+            return int(value)
+        except (TypeError, ValueError, OverflowError):
+            raise ValueError(f"{name} must be an integer") from None
 
 
 class Rule(BaseModel):
@@ -421,6 +425,24 @@ class VisionAttributes(BaseModel):
             return v.strip().lower()
         return v
 
+    @classmethod
+    def from_provider(
+        cls, result: Dict[str, Any], trusted: bool = False
+    ) -> "VisionAttributes":
+        """
+        Build VisionAttributes from a vision provider result.
+
+        Args:
+            result: Attribute dict returned by a vision provider
+            trusted: Skip validation for results known to be schema-valid
+
+        Returns:
+            VisionAttributes for the result
+        """
+        if trusted:
+            return cls.model_construct(**result)
+        return cls(**result)
+
     class Config:
         use_enum_values = True
 
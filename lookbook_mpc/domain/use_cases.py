@@ -64,9 +64,13 @@ class IngestItems(UseCase):
             for item in shop_items:
                 try:
                     # Analyze item image
-                    vision_attrs = await self.vision_adapter.analyze_image(
+                    vision_result = await self.vision_adapter.analyze_image(
                         item.image_key
                     )
+                    vision_attrs = VisionAttributes.from_provider(
+                        vision_result,
+                        trusted=getattr(self.vision_adapter, "trusted_results", False),
+                    )
 
                     # Create enhanced item with vision attributes
                     enhanced_item = Item(
@@ -197,6 +201,11 @@ class BuildLookbook(UseCase):
         try:
             # Get all items from repository
             all_items = await self.lookbook_repo.get_all_items()
+            # Dump entities once for all the outfits generated below
+            all_items = [
+                item if isinstance(item, dict) else item.model_dump()
+                for item in all_items
+            ]
 
             # Generate multiple outfit combinations
             outfits = []
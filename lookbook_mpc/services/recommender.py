@@ -5,14 +5,124 @@ This service implements the core recommendation logic for
 completing outfits based on user intent and available items.
 """
 
+from dataclasses import dataclass
 from typing import Dict, List, Any, Optional, Tuple
 import random
 import logging
+import numpy as np
 import structlog
 import aiohttp
 
 logger = structlog.get_logger()
 
+# Outfit categories; an item's category code is its index here
+CATEGORIES = ("top", "bottom", "dress", "outerwear", "shoes", "accessory")
+_CATEGORY_CODES = {category: code for code, category in enumerate(CATEGORIES)}
+_ACCESSORY = _CATEGORY_CODES["accessory"]
+
+NEUTRAL_COLORS = frozenset({"black", "white", "navy", "grey", "beige"})
+
+# Color code 0 means the item has no color; every other color owns bit
+# ``1 << code`` so an outfit's palette is the OR of its items' bits.
+# Codes are assigned per batch, seeded with the neutrals so they share a fixed mask.
+_NO_COLOR = 0
+# Code for an item whose color could not be read; outfits containing it get no bonus
+_COLOR_ERROR = -1
+_NEUTRAL_CODES: Dict[str, int] = {
+    color: code for code, color in enumerate(sorted(NEUTRAL_COLORS), start=1)
+}
+_NEUTRAL_MASK = sum(1 << code for code in _NEUTRAL_CODES.values())
+
+# Candidates per tile when picking the best item of a category
+SCORING_TILE_SIZE = 64
+
+
+def _as_dict(item: Any) -> Dict[str, Any]:
+    """Return an item as a dict, dumping pydantic entities."""
+    if isinstance(item, dict):
+        return item
+    return item.model_dump(mode="python")
+
+
+@dataclass
+class ItemColumns:
+    """
+    Candidate items as parallel arrays (structure of arrays).
+
+    Scoring only touches a few fields per item, so they are pulled out of the
+    nested item dicts once; ``items`` keeps the original dicts for the response.
+    """
+
+    items: List[Dict[str, Any]]
+    rule_score: np.ndarray
+    price: np.ndarray
+    category: np.ndarray
+    color: np.ndarray
+
+    @classmethod
+    def from_items(cls, items: List[Dict[str, Any]]) -> "ItemColumns":
+        """Extract the scoring columns from item dicts."""
+        count = len(items)
+        rule_score = np.empty(count)
+        price = np.empty(count)
+        category = np.empty(count, dtype=np.int16)
+        color = np.zeros(count, dtype=np.int32)
+        color_codes = dict(_NEUTRAL_CODES)
+
+        for i, item in enumerate(items):
+            rule_score[i] = item.get("rule_score", 0)
+            price[i] = item.get("price", 0)
+
+            vision_attrs = item.get("attributes", {}).get("vision_attributes", {})
+            category[i] = _CATEGORY_CODES.get(vision_attrs.get("category", "accessory"), _ACCESSORY)
+
+            try:
+                item_color = vision_attrs.get("color", "")
+                if item_color:
+                    color[i] = color_codes.setdefault(item_color.lower(), len(color_codes) + 1)
+            except Exception:
+                color[i] = _COLOR_ERROR
+
+        return cls(items, rule_score, price, category, color)
+
+
+@dataclass
+class ScoringTiles:
+    """
+    Score-ordered candidates scanned in fixed-size tiles.
+
+    Each tile is scored with a handful of numpy ops on short slices. Scores
+    are sorted in descending order and the price penalty only ever shrinks
+    a score, so a tile whose leading score cannot beat the best seen so far
+    ends the scan.
+    """
+
+    scores: np.ndarray
+    prices: np.ndarray
+    size: int = SCORING_TILE_SIZE
+
+    def argmax_penalized(self, avg_price: float) -> Tuple[int, float]:
+        """Return the position and value of the best price-penalized score."""
+        best, best_value = 0, -np.inf
+        # The bound only holds when the penalty lies in [0, 0.5]
+        bounded = avg_price > 0
+        for start in range(0, self.scores.size, self.size):
+            head = self.scores[start]
+            if bounded and best_value >= max(head, 0.5 * head):
+                break
+
+            scores = self.scores[start:start + self.size]
+            prices = self.prices[start:start + self.size]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                penalty = np.minimum(np.abs(prices - avg_price) / avg_price, 0.5)
+            combined = np.nan_to_num(scores * (1 - penalty), nan=-np.inf)
+
+            # argmax picks the first maximum, and ">" keeps earlier tiles on ties
+            top = int(np.argmax(combined))
+            if combined[top] > best_value:
+                best, best_value = start + top, float(combined[top])
+        return best, best_value
+
 
 class OutfitRecommender:
     """Outfit recommendation service."""
@@ -32,7 +142,7 @@ class OutfitRecommender:
 
         Args:
             intent: User intent dictionary
-            candidate_items: List of candidate items
+            candidate_items: List of candidate items (dicts or Item entities)
             max_outfits: Maximum number of outfits to generate
 
         Returns:
@@ -47,6 +157,8 @@ class OutfitRecommender:
             # Get rules for this intent
             rules = self.rules_engine.get_rules_for_intent(intent.get("intent", "casual"))
 
+            candidate_items = [_as_dict(item) for item in candidate_items]
+
             if not rules:
                 self.logger.warning("No rules found for intent", intent=intent)
                 return []
@@ -58,10 +170,13 @@ class OutfitRecommender:
                 self.logger.warning("No items match the rules", intent=intent)
                 return []
 
+            # Extract the scoring columns once for every outfit built below
+            columns = ItemColumns.from_items(filtered_items)
+
             # Generate outfit combinations
             outfits = []
             for i in range(min(max_outfits, len(filtered_items) // 3)):  # Need at least 3 items per outfit
-                outfit = await self._generate_single_outfit(filtered_items, rules, intent)
+                outfit = await self._generate_single_outfit(filtered_items, rules, intent, columns)
                 if outfit:
                     outfits.append(outfit)
 
@@ -81,50 +196,36 @@ class OutfitRecommender:
         self,
         items: List[Dict[str, Any]],
         rules: Dict[str, Any],
-        intent: Dict[str, Any]
+        intent: Dict[str, Any],
+        columns: Optional[ItemColumns] = None
     ) -> Optional[Dict[str, Any]]:
         """Generate a single outfit combination."""
         try:
-            # Group items by category
-            categorized_items = self._categorize_items(items)
+            if columns is None:
+                columns = ItemColumns.from_items(items)
 
-            # Build outfit based on rules
-            outfit_items = {}
+            # Group item indices by category
+            categorized = self._categorize_indices(columns)
 
-            # Select top item for each required category
-            required_categories = self._get_required_categories(rules)
+            # Build outfit based on rules: category -> chosen item index
+            chosen: Dict[str, int] = {}
 
-            for category in required_categories:
-                if category in categorized_items and categorized_items[category]:
-                    # Select best item for this category
-                    best_item = self._select_best_item_for_category(
-                        categorized_items[category],
-                        category,
-                        rules
-                    )
-                    if best_item:
-                        outfit_items[category] = best_item
-
-            # Add optional items if we have space
+            # Select top item for each required category, then optional ones
+            required_categories = self._get_required_categories(rules)
             optional_categories = self._get_optional_categories(rules)
-            for category in optional_categories:
-                if category in categorized_items and categorized_items[category]:
-                    # Check if we already have an item for this category
-                    if category not in outfit_items:
-                        best_item = self._select_best_item_for_category(
-                            categorized_items[category],
-                            category,
-                            rules
-                        )
-                        if best_item:
-                            outfit_items[category] = best_item
+
+            for category in [*required_categories, *optional_categories]:
+                indices = categorized.get(category)
+                if indices is not None and indices.size and category not in chosen:
+                    chosen[category] = self._select_best_index(columns, indices, category)
 
             # Ensure we have a complete outfit
-            if len(outfit_items) < 2:  # At least 2 items for a basic outfit
+            if len(chosen) < 2:  # At least 2 items for a basic outfit
                 return None
 
             # Calculate overall outfit score
-            outfit_score = self._calculate_outfit_score(outfit_items, rules)
+            outfit_score = self._score_outfit_columns(columns, np.fromiter(chosen.values(), dtype=np.intp))
+            outfit_items = {category: items[index] for category, index in chosen.items()}
 
             # Build outfit response
             outfit = {
@@ -150,26 +251,22 @@ class OutfitRecommender:
             self.logger.error("Error generating single outfit", error=str(e))
             return None
 
-    def _categorize_items(self, items: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
-        """Group items by their category."""
-        categorized = {
-            "top": [],
-            "bottom": [],
-            "dress": [],
-            "outerwear": [],
-            "shoes": [],
-            "accessory": []
+    def _categorize_indices(self, columns: ItemColumns) -> Dict[str, np.ndarray]:
+        """Group item indices by category code."""
+        return {
+            category: np.flatnonzero(columns.category == code)
+            for code, category in enumerate(CATEGORIES)
         }
 
+    def _categorize_items(self, items: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+        """Group items by their category."""
+        categorized: Dict[str, List[Dict[str, Any]]] = {category: [] for category in CATEGORIES}
+        # Only the category is read; building full ItemColumns would also
+        # convert every score, price and color
         for item in items:
             vision_attrs = item.get("attributes", {}).get("vision_attributes", {})
-            category = vision_attrs.get("category", "accessory")
-
-            if category in categorized:
-                categorized[category].append(item)
-            else:
-                categorized["accessory"].append(item)
-
+            category = CATEGORIES[_CATEGORY_CODES.get(vision_attrs.get("category"), _ACCESSORY)]
+            categorized[category].append(item)
         return categorized
 
     def _get_required_categories(self, rules: Dict[str, Any]) -> List[str]:
@@ -190,6 +287,29 @@ class OutfitRecommender:
         """Get optional categories based on rules."""
         return ["outerwear", "shoes", "accessory"]
 
+    def _select_best_index(self, columns: ItemColumns, indices: np.ndarray, category: str) -> int:
+        """Select the index of the best item for a category among ``indices``."""
+        scores = columns.rule_score[indices]
+
+        # Sort by rule score first (stable, so ties keep their input order)
+        order = np.argsort(-scores, kind="stable")
+        best = int(indices[order[0]])
+
+        # For dresses, or a single candidate, take the top scorer
+        if category == "dress" or indices.size == 1:
+            return best
+
+        # For other categories, balance score against distance from the average price
+        prices = columns.price[indices[order]]
+        avg_price = prices.sum() / prices.size
+        tiles = ScoringTiles(scores[order], prices)
+        top, top_value = tiles.argmax_penalized(avg_price)
+
+        # Same pick as a strict ">" scan in score order
+        if top_value > 0:
+            return int(indices[order[top]])
+        return best
+
     def _select_best_item_for_category(
         self,
         items: List[Dict[str, Any]],
@@ -200,85 +320,62 @@ class OutfitRecommender:
         if not items:
             return None
 
-        # Sort by rule score first
-        sorted_items = sorted(items, key=lambda x: x.get("rule_score", 0), reverse=True)
-
-        # For dresses, we only need one item
-        if category == "dress":
-            return sorted_items[0]
+        columns = ItemColumns.from_items(items)
+        return items[self._select_best_index(columns, np.arange(len(items)), category)]
 
-        # For other categories, consider price diversity
-        if len(sorted_items) > 1:
-            # Try to get items with different price points
-            prices = [item.get("price", 0) for item in sorted_items]
-            avg_price = sum(prices) / len(prices)
+    def _score_outfit_columns(self, columns: ItemColumns, indices: np.ndarray) -> float:
+        """Calculate overall outfit score for the items at ``indices``."""
+        if not indices.size:
+            return 0.0
 
-            # Select item closest to average price but with good score
-            best_item = None
-            best_score = 0
+        # Outfits hold a handful of items, where a numpy reduction costs more
+        # than summing the scores as Python floats
+        scores = columns.rule_score[indices].tolist()
 
-            for item in sorted_items:
-                score = item.get("rule_score", 0)
-                price = item.get("price", 0)
-                price_diff = abs(price - avg_price)
+        # Average of individual item scores
+        avg_score = sum(scores) / len(scores)
 
-                # Balance score and price appropriateness
-                combined_score = score * (1 - min(price_diff / avg_price, 0.5))
+        # Bonus for complete outfit
+        completeness_bonus = min(len(scores) / 4, 0.2)  # Max 20% bonus
 
-                if combined_score > best_score:
-                    best_score = combined_score
-                    best_item = item
+        # Bonus for color coordination (simplified)
+        color_bonus = self._color_bonus_columns(columns, indices)
 
-            return best_item or sorted_items[0]
+        total_score = avg_score + completeness_bonus + color_bonus
 
-        return sorted_items[0]
+        return float(min(total_score, 1.0))
 
     def _calculate_outfit_score(self, outfit_items: Dict[str, Dict[str, Any]], rules: Dict[str, Any]) -> float:
         """Calculate overall outfit score."""
-        if not outfit_items:
+        columns = ItemColumns.from_items(list(outfit_items.values()))
+        return self._score_outfit_columns(columns, np.arange(len(outfit_items)))
+
+    def _color_bonus_columns(self, columns: ItemColumns, indices: np.ndarray) -> float:
+        """Calculate color coordination bonus from color codes."""
+        colored = 0
+        palette = 0
+        for code in columns.color[indices].tolist():
+            if code == _COLOR_ERROR:
+                return 0.0
+            if code != _NO_COLOR:
+                colored += 1
+                palette |= 1 << code
+        if colored < 2:
             return 0.0
 
-        # Average of individual item scores
-        item_scores = [item.get("rule_score", 0) for item in outfit_items.values()]
-        avg_score = sum(item_scores) / len(item_scores)
-
-        # Bonus for complete outfit
-        completeness_bonus = min(len(outfit_items) / 4, 0.2)  # Max 20% bonus
-
-        # Bonus for color coordination (simplified)
-        color_bonus = self._calculate_color_coordination_bonus(outfit_items)
-
-        total_score = avg_score + completeness_bonus + color_bonus
-
-        return min(total_score, 1.0)
+        # Bonus for neutral colors: no bit outside the neutral mask
+        if not palette & ~_NEUTRAL_MASK:
+            return 0.1  # All neutral is good
+        elif palette.bit_count() <= 2:
+            return 0.05  # Few colors is good
+        else:
+            return 0.0  # Too many colors
 
     def _calculate_color_coordination_bonus(self, outfit_items: Dict[str, Dict[str, Any]]) -> float:
         """Calculate color coordination bonus (simplified)."""
         try:
-            colors = []
-            for item in outfit_items.values():
-                vision_attrs = item.get("attributes", {}).get("vision_attributes", {})
-                color = vision_attrs.get("color", "")
-                if color:
-                    colors.append(color.lower())
-
-            if len(colors) < 2:
-                return 0.0
-
-            # Simple coordination check
-            unique_colors = set(colors)
-
-            # Bonus for neutral colors
-            neutral_colors = {"black", "white", "navy", "grey", "beige"}
-            neutral_count = sum(1 for color in unique_colors if color in neutral_colors)
-
-            if neutral_count == len(unique_colors):
-                return 0.1  # All neutral is good
-            elif len(unique_colors) <= 2:
-                return 0.05  # Few colors is good
-            else:
-                return 0.0  # Too many colors
-
+            columns = ItemColumns.from_items(list(outfit_items.values()))
+            return self._color_bonus_columns(columns, np.arange(len(outfit_items)))
         except Exception:
             return 0.0
 
@@ -293,7 +390,7 @@ class OutfitRecommender:
 
         Args:
             theme: Lookbook theme
-            items: Available items
+            items: Available items (dicts or Item entities)
             constraints: Additional constraints
 
         Returns:
@@ -317,6 +414,7 @@ class OutfitRecommender:
                 return None
 
             # Apply rules to filter items
+            items = [_as_dict(item) for item in items]
             filtered_items = self.rules_engine.apply_rules_to_items(items, rules)
 
             if not filtered_items:
@@ -5,12 +5,71 @@ This service implements the rules engine that maps user intents
 to specific constraints and outfit composition rules.
 """
 
-from typing import Dict, List, Any, Optional
+from functools import lru_cache
+from numbers import Number
+from typing import Dict, List, Any, Optional, Tuple
 import logging
+import numpy as np
 import structlog
 
 logger = structlog.get_logger()
 
+# Rule keys whose list values are matched by membership
+_MEMBERSHIP_CONSTRAINTS = ("category", "material", "color", "pattern")
+_EXCLUSION_KEYS = ("excluded_categories", "excluded_patterns")
+
+# Score contributed by each matched constraint, applied in this order
+_CONSTRAINT_WEIGHTS = (("category", 0.3), ("material", 0.2), ("color", 0.2), ("pattern", 0.15))
+
+# Code 0 marks a missing/empty attribute, which constraints never reject
+_MISSING = 0
+# Code for a value that cannot be encoded (e.g. a list); it matches no rule value
+_UNREADABLE = -1
+
+
+def build_item_columns(items: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Convert item dicts into columnar arrays for vectorized rule filtering.
+
+    Vision attributes become integer category codes (0 when missing, -1 when
+    the value cannot be encoded), with the value -> code tables kept under
+    "codes" so rule values can be translated. Non-numeric prices become NaN.
+    Items whose attributes cannot be read at all are flagged in the "valid" column.
+    """
+    count = len(items)
+    codes: Dict[str, Dict[Any, int]] = {key: {} for key in _MEMBERSHIP_CONSTRAINTS}
+    columns: Dict[str, Any] = {
+        key: np.zeros(count, dtype=np.int32) for key in _MEMBERSHIP_CONSTRAINTS
+    }
+    price = np.full(count, np.nan)
+    valid = np.ones(count, dtype=bool)
+
+    for i, item in enumerate(items):
+        try:
+            vision_attrs = item.get("attributes", {}).get("vision_attributes", {})
+            values = [vision_attrs.get(key) for key in _MEMBERSHIP_CONSTRAINTS]
+        except Exception:
+            valid[i] = False
+            continue
+
+        # A bad value only affects the rules that constrain its own column
+        for key, value in zip(_MEMBERSHIP_CONSTRAINTS, values):
+            if value:
+                table = codes[key]
+                try:
+                    columns[key][i] = table.setdefault(value, len(table) + 1)
+                except TypeError:
+                    columns[key][i] = _UNREADABLE
+
+        item_price = item.get("price", 0)
+        if isinstance(item_price, Number):
+            price[i] = item_price
+
+    columns["price"] = price
+    columns["valid"] = valid
+    columns["codes"] = codes
+    return columns
+
 
 class RulesEngine:
     """Rules engine for fashion recommendations."""
@@ -18,6 +77,12 @@ class RulesEngine:
     def __init__(self):
         self.logger = logger.bind(service="rules_engine")
         self.rules = self._load_default_rules()
+        # Per-instance memo of normalized intent -> rules; cleared on rule changes
+        self._lookup = lru_cache(maxsize=512)(self._lookup_uncached)
+        # id(rule dict) -> (rule dict, source values, frozenset matchers); holding
+        # the dict keeps its id from being reused while the entry exists
+        self._compiled_rules: Dict[int, Tuple[Dict[str, Any], Tuple, Dict[str, Any]]] = {}
+        self._compile_all()
 
     def _load_default_rules(self) -> Dict[str, Any]:
         """Load default rules for different intents."""
@@ -135,24 +200,68 @@ class RulesEngine:
         """
         try:
             # Normalize intent string
-            normalized_intent = intent.lower().strip()
-
-            # Try exact match first
-            if normalized_intent in self.rules:
-                return self.rules[normalized_intent]
-
-            # Try partial match
-            for rule_intent, rule_data in self.rules.items():
-                if normalized_intent in rule_intent or rule_intent in normalized_intent:
-                    return rule_data
-
-            # Return default rules if no specific match
-            return self.rules.get("casual")
+            return self._lookup(intent.lower().strip())
 
         except Exception as e:
             self.logger.error("Error getting rules for intent", intent=intent, error=str(e))
             return self.rules.get("casual")
 
+    def _lookup_uncached(self, normalized_intent: str) -> Optional[Dict[str, Any]]:
+        """Resolve a normalized intent to its rules (memoized via self._lookup)."""
+        # Try exact match first
+        if normalized_intent in self.rules:
+            return self.rules[normalized_intent]
+
+        # Try partial match
+        for rule_intent, rule_data in self.rules.items():
+            if normalized_intent in rule_intent or rule_intent in normalized_intent:
+                return rule_data
+
+        # Return default rules if no specific match
+        return self.rules.get("casual")
+
+    @staticmethod
+    def _rule_source(rules: Dict[str, Any]) -> Tuple:
+        """Snapshot the rule values the matchers are built from."""
+        constraints = rules.get("constraints", {})
+        return (
+            tuple(tuple(constraints[key]) if key in constraints else None for key in _MEMBERSHIP_CONSTRAINTS),
+            tuple(tuple(rules[key]) if key in rules else None for key in _EXCLUSION_KEYS),
+            tuple(rules["budget_range"]) if "budget_range" in rules else None,
+        )
+
+    def _compile(self, source: Tuple) -> Dict[str, Any]:
+        """Turn a rule's constraint lists into frozensets for O(1) membership tests."""
+        constraint_values, exclusion_values, budget_range = source
+        compiled: Dict[str, Any] = {
+            key: frozenset(values) if values is not None else None
+            for key, values in zip(_MEMBERSHIP_CONSTRAINTS, constraint_values)
+        }
+        for key, values in zip(_EXCLUSION_KEYS, exclusion_values):
+            compiled[key] = frozenset(values) if values is not None else None
+        compiled["budget_range"] = budget_range
+        return compiled
+
+    def _compile_all(self) -> None:
+        """Precompile every registered rule."""
+        self._compiled_rules = {}
+        for rule_data in self.rules.values():
+            source = self._rule_source(rule_data)
+            self._compiled_rules[id(rule_data)] = (rule_data, source, self._compile(source))
+
+    def _compiled(self, rules: Dict[str, Any]) -> Dict[str, Any]:
+        """Return the matchers for a rule dict, recompiling it if it was edited in place."""
+        source = self._rule_source(rules)
+        entry = self._compiled_rules.get(id(rules))
+        registered = entry is not None and entry[0] is rules
+        if registered and entry[1] == source:
+            return entry[2]
+
+        compiled = self._compile(source)
+        if registered:
+            self._compiled_rules[id(rules)] = (rules, source, compiled)
+        return compiled
+
     def apply_rules_to_items(self, items: List[Dict[str, Any]], rules: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
         Apply rules to filter and score items.
@@ -167,15 +276,15 @@ class RulesEngine:
         try:
             self.logger.info("Applying rules to items", item_count=len(items), rules=rules.get("name", "unknown"))
 
-            filtered_items = []
-
-            for item in items:
-                if self._item_matches_rules(item, rules):
-                    scored_item = self._score_item_for_rules(item, rules)
-                    filtered_items.append(scored_item)
+            columns = build_item_columns(items)
+            indices, scores = self.apply_rules_vectorized(columns, rules)
 
-            # Sort by score (descending)
-            filtered_items.sort(key=lambda x: x.get("rule_score", 0), reverse=True)
+            # Only the surviving rows are turned back into dicts
+            filtered_items = []
+            for index, score in zip(indices.tolist(), scores.tolist()):
+                scored_item = items[index].copy()
+                scored_item["rule_score"] = score
+                filtered_items.append(scored_item)
 
             self.logger.info("Rule application completed",
                            original_count=len(items),
@@ -187,112 +296,59 @@ class RulesEngine:
             self.logger.error("Error applying rules to items", error=str(e))
             return []
 
-    def _item_matches_rules(self, item: Dict[str, Any], rules: Dict[str, Any]) -> bool:
-        """Check if an item matches the given rules."""
-        try:
-            vision_attrs = item.get("attributes", {}).get("vision_attributes", {})
-
-            # Check included categories
-            if "constraints" in rules and "category" in rules["constraints"]:
-                allowed_categories = rules["constraints"]["category"]
-                item_category = vision_attrs.get("category")
-                if item_category and item_category not in allowed_categories:
-                    return False
-
-            # Check excluded categories
-            if "excluded_categories" in rules:
-                excluded_categories = rules["excluded_categories"]
-                item_category = vision_attrs.get("category")
-                if item_category and item_category in excluded_categories:
-                    return False
-
-            # Check material constraints
-            if "constraints" in rules and "material" in rules["constraints"]:
-                allowed_materials = rules["constraints"]["material"]
-                item_material = vision_attrs.get("material")
-                if item_material and item_material not in allowed_materials:
-                    return False
-
-            # Check color constraints
-            if "constraints" in rules and "color" in rules["constraints"]:
-                allowed_colors = rules["constraints"]["color"]
-                item_color = vision_attrs.get("color")
-                if item_color and item_color not in allowed_colors:
-                    return False
-
-            # Check pattern constraints
-            if "constraints" in rules and "pattern" in rules["constraints"]:
-                allowed_patterns = rules["constraints"]["pattern"]
-                item_pattern = vision_attrs.get("pattern")
-                if item_pattern and item_pattern not in allowed_patterns:
-                    return False
-
-            # Check excluded patterns
-            if "excluded_patterns" in rules:
-                excluded_patterns = rules["excluded_patterns"]
-                item_pattern = vision_attrs.get("pattern")
-                if item_pattern and item_pattern in excluded_patterns:
-                    return False
-
-            # Check budget constraints
-            if "budget_range" in rules:
-                min_budget, max_budget = rules["budget_range"]
-                item_price = item.get("price", 0)
-                if not (min_budget <= item_price <= max_budget):
-                    return False
-
-            return True
-
-        except Exception as e:
-            self.logger.warning("Error checking item against rules", error=str(e))
-            return False
-
-    def _score_item_for_rules(self, item: Dict[str, Any], rules: Dict[str, Any]) -> Dict[str, Any]:
-        """Score an item based on how well it matches the rules."""
-        try:
-            scored_item = item.copy()
-            score = 0.0  # Base score
-
-            vision_attrs = item.get("attributes", {}).get("vision_attributes", {})
-
-            # Score based on category match
-            if "constraints" in rules and "category" in rules["constraints"]:
-                if vision_attrs.get("category") in rules["constraints"]["category"]:
-                    score += 0.3
-
-            # Score based on material match
-            if "constraints" in rules and "material" in rules["constraints"]:
-                if vision_attrs.get("material") in rules["constraints"]["material"]:
-                    score += 0.2
-
-            # Score based on color match
-            if "constraints" in rules and "color" in rules["constraints"]:
-                if vision_attrs.get("color") in rules["constraints"]["color"]:
-                    score += 0.2
-
-            # Score based on pattern match
-            if "constraints" in rules and "pattern" in rules["constraints"]:
-                if vision_attrs.get("pattern") in rules["constraints"]["pattern"]:
-                    score += 0.15
-
-            # Score based on budget fit
-            if "budget_range" in rules:
-                min_budget, max_budget = rules["budget_range"]
-                item_price = item.get("price", 0)
-                if min_budget <= item_price <= max_budget:
-                    score += 0.15
-                elif item_price <= max_budget:
-                    score += 0.05  # Partial score for under budget
-
-            # Normalize score to 0-1 range
-            scored_item["rule_score"] = min(score, 1.0)
+    def apply_rules_vectorized(
+        self, columns: Dict[str, Any], rules: Dict[str, Any]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Filter and score columnar items against rules.
 
-            return scored_item
+        Args:
+            columns: Item columns from build_item_columns
+            rules: Rules dictionary with constraints
 
-        except Exception as e:
-            self.logger.warning("Error scoring item for rules", error=str(e))
-            item["rule_score"] = 0.0
-            return item
+        Returns:
+            Indices of matching items ordered by descending score, and their scores
+        """
+        # Registered rules are precompiled; ad-hoc rule dicts compile once per call
+        compiled = self._compiled(rules)
+        codes = columns["codes"]
+        price = columns["price"]
+
+        mask = columns["valid"].copy()
+        score = np.zeros(len(mask))
+
+        def member(key: str, allowed: frozenset) -> np.ndarray:
+            allowed_codes = [code for value, code in codes[key].items() if value in allowed]
+            return np.isin(columns[key], allowed_codes)
+
+        for key, weight in _CONSTRAINT_WEIGHTS:
+            allowed = compiled[key]
+            if allowed is None:
+                continue
+            matched = member(key, allowed)
+            # Missing attributes pass the filter but earn no score
+            mask &= matched | (columns[key] == _MISSING)
+            score += weight * matched
+
+        for key, column in (("excluded_categories", "category"), ("excluded_patterns", "pattern")):
+            if compiled[key] is not None:
+                mask &= ~member(column, compiled[key])
+
+        if compiled["budget_range"] is not None:
+            min_budget, max_budget = compiled["budget_range"]
+            # NaN prices compare False and are dropped, like unpriced items before
+            in_budget = (min_budget <= price) & (price <= max_budget)
+            mask &= in_budget
+            score += np.where(in_budget, 0.15, np.where(price <= max_budget, 0.05, 0.0))
+
+        # Normalize score to 0-1 range
+        score = np.minimum(score, 1.0)
+
+        indices = np.flatnonzero(mask)
+        # Stable descending sort keeps input order among equal scores
+        order = np.argsort(-score[indices], kind="stable")
+        indices = indices[order]
+        return indices, score[indices]
 
     def add_custom_rule(self, intent: str, rule_data: Dict[str, Any]) -> None:
         """
@@ -304,6 +360,8 @@ class RulesEngine:
         """
         try:
             self.rules[intent.lower().strip()] = rule_data
+            self._lookup.cache_clear()
+            self._compile_all()
             self.logger.info("Custom rule added", intent=intent)
         except Exception as e:
             self.logger.error("Error adding custom rule", intent=intent, error=str(e))
@@ -65,6 +65,7 @@ async def test_vision_analysis():
         print("\nTest 3: Testing Ollama vision provider...")
         ollama_url = "http://localhost:11434"  # Default Ollama host
 
+        ollama_provider = None
         try:
             ollama_provider = VisionProviderOllama(f"{ollama_url}/api")
             print(f"  Ollama provider initialized with URL: {ollama_url}")
@@ -75,6 +76,10 @@ async def test_vision_analysis():
 
         except Exception as e:
             print(f"  ⚠️  Ollama provider initialization failed (expected if sidecar not running): {e}")
+        finally:
+            # The provider keeps one HTTP session open across calls
+            if ollama_provider is not None:
+                await ollama_provider.close()
 
         print("\n🎉 Vision analysis tests completed!")
 
@@ -8,7 +8,11 @@ This module contains pytest configuration and fixtures.
 import pytest
 import asyncio
 import os
+import re
+from pathlib import Path
+from types import MappingProxyType
 from fastapi.testclient import TestClient
+from httpx import ASGITransport, AsyncClient
 
 
 @pytest.fixture(scope="session")
@@ -19,6 +23,51 @@ def event_loop():
     loop.close()
 
 
+@pytest.fixture(scope="session")
+def app():
+    """FastAPI application, imported on first use rather than at collection.
+
+    Session scope is per process, so each xdist worker holds its own copy.
+    """
+    from main import app as fastapi_app
+
+    return fastapi_app
+
+
+@pytest.fixture(scope="session")
+def client(app):
+    """Session-wide TestClient; the app lifespan runs once for the whole run."""
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="session")
+async def aclient(app):
+    """Async client over ASGITransport, for tests that issue requests concurrently."""
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as async_client:
+        yield async_client
+
+
+@pytest.fixture(scope="session")
+async def healthy_app(aclient):
+    """Skip dependent tests unless the app answers /health as healthy.
+
+    Checked once per worker; the skip is cached for every later request.
+    """
+    response = await aclient.get("/health")
+    data = response.json() if response.status_code == 200 else {}
+    if not (data.get("status") == "healthy" and "service" in data and "version" in data):
+        pytest.skip("/health check failed")
+
+
+@pytest.fixture(scope="session")
+def openapi_schema(app):
+    """OpenAPI schema generated once, straight from the app."""
+    return app.openapi()
+
+
 @pytest.fixture(scope="function", autouse=True)
 def test_env():
     """Set up test environment variables."""
@@ -50,6 +99,28 @@ def test_env():
             os.environ[key] = value
 
 
+@pytest.fixture(autouse=True)
+def auto_profile(request):
+    """Write a pyinstrument HTML profile per test when PROFILE=1."""
+    if os.environ.get("PROFILE") != "1":
+        yield
+        return
+
+    from pyinstrument import Profiler
+
+    profiler = Profiler(async_mode="enabled")
+    profiler.start()
+    yield
+    profiler.stop()
+
+    # Key the file on the full node id: test names repeat across modules and
+    # xdist workers would otherwise overwrite each other's profiles
+    profile_name = re.sub(r"[^\w.\[\]-]+", ".", request.node.nodeid)
+    profile_dir = Path("profiles")
+    profile_dir.mkdir(exist_ok=True)
+    (profile_dir / f"{profile_name}.html").write_text(profiler.output_html())
+
+
 @pytest.fixture
 def sample_item_data():
     """Sample item data for testing."""
@@ -130,6 +201,73 @@ def sample_chat_message():
     }
 
 
+@pytest.fixture(scope="module")
+def valid_item_kwargs():
+    """Canonical valid Item kwargs; override with {**valid_item_kwargs, ...}."""
+    return MappingProxyType(
+        {
+            "sku": "TEST001",
+            "title": "Test Item",
+            "price": 29.99,
+            "size_range": ["S", "M", "L"],
+            "image_key": "test-image.jpg",
+            "attributes": {"color": "blue", "material": "cotton"},
+            "in_stock": True,
+        }
+    )
+
+
+@pytest.fixture(scope="module")
+def valid_outfit_kwargs():
+    """Canonical valid Outfit kwargs."""
+    return MappingProxyType(
+        {
+            "title": "Summer Casual",
+            "intent_tags": {"occasion": "casual", "season": "summer"},
+            "rationale": "Perfect for warm weather",
+            "score": 0.85,
+        }
+    )
+
+
+@pytest.fixture(scope="module")
+def valid_outfit_item_kwargs():
+    """Canonical valid OutfitItem kwargs."""
+    return MappingProxyType({"outfit_id": 1, "item_id": 2, "role": "top"})
+
+
+@pytest.fixture(scope="module")
+def valid_rule_kwargs():
+    """Canonical valid Rule kwargs."""
+    return MappingProxyType(
+        {
+            "name": "Yoga Rule",
+            "intent": "yoga",
+            "constraints": {"category": ["activewear"], "material": ["stretch"]},
+            "priority": 5,
+            "is_active": True,
+        }
+    )
+
+
+@pytest.fixture(scope="module")
+def valid_intent_kwargs():
+    """Canonical valid Intent kwargs."""
+    return MappingProxyType(
+        {
+            "intent": "recommend_outfits",
+            "activity": "yoga",
+            "occasion": "yoga",
+            "budget_max": 50.0,
+            "objectives": ["slimming"],
+            "palette": ["dark", "monochrome"],
+            "formality": "casual",
+            "timeframe": "this_weekend",
+            "size": "L",
+        }
+    )
+
+
 # Configure pytest settings
 def pytest_configure(config):
     """Configure pytest settings."""
@@ -147,12 +285,14 @@ def pytest_configure(config):
 def pytest_collection_modifyitems(config, items):
     """Modify test collection to add markers."""
     for item in items:
-        # Mark all tests as either unit or integration
-        if "integration" in item.nodeid:
+        # Mark all tests as either unit or integration, keeping explicit marks
+        if item.get_closest_marker("unit") or item.get_closest_marker("integration"):
+            pass
+        elif "integration" in item.nodeid:
             item.add_marker(pytest.mark.integration)
         else:
             item.add_marker(pytest.mark.unit)
 
         # Mark slow tests
         if "slow" in item.nodeid or "performance" in item.nodeid:
-            item.add_marker(pytest.mark.slow)
\ No newline at end of file
+            item.add_marker(pytest.mark.slow)
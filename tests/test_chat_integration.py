@@ -1,53 +1,94 @@
 """
 Chat Integration Tests
 
-Comprehensive testing of chat functionality using FastAPI TestClient.
+Comprehensive testing of chat functionality using httpx AsyncClient over ASGITransport.
 Converted from scripts/archive/test_chat_direct.py for formal test suite integration.
 """
 
+import asyncio
 import pytest
 import json
+import orjson
 import uuid
 from typing import Dict, Any, List
-from fastapi.testclient import TestClient
+from pydantic import ValidationError
 
-from main import app
 from lookbook_mpc.domain.entities import ChatRequest, ChatResponse
 
+VALID_CHAT_REQUEST = {"session_id": "test-123", "message": "Hello"}
+EMPTY_MESSAGE_CHAT_REQUEST = {"session_id": "test", "message": ""}
+
+JSON_HDR = {"content-type": "application/json"}
+
+FASHION_QUERIES = [
+    "I want to look slim",
+    "Beach vacation outfits",
+    "Party dress for Saturday night",
+    "Professional work clothes",
+    "Comfortable sportswear",
+    "Elegant formal wear",
+    "Casual weekend outfits",
+]
+ADDITIONAL_QUERIES = [
+    "Red dress for date night",
+    "Black suit for interview",
+    "Summer tops under ฿1000",
+]
+
+CONVERSATION_STEPS = [
+    "I need an outfit for yoga",
+    "What about something for a business meeting?",
+    "Show me casual outfits under ฿2000",
+    "I prefer black and white colors",
+    "Any recommendations for summer season?",
+]
+
+# Request bodies serialized once, posted as raw bytes
+FASHION_BODIES = [orjson.dumps({"message": q}) for q in FASHION_QUERIES]
+ADDITIONAL_BODIES = [orjson.dumps({"message": q}) for q in ADDITIONAL_QUERIES]
+
 
 @pytest.mark.integration
 @pytest.mark.chat
+@pytest.mark.usefixtures("healthy_app")
 class TestChatIntegration:
     """Test suite for chat integration testing."""
 
     @pytest.fixture
-    def client(self):
-        """FastAPI test client fixture."""
-        return TestClient(app)
+    async def chat_session(self, aclient):
+        """Open a fresh chat session for one test and delete it afterwards."""
+        response = await aclient.post("/v1/chat", json={"message": "I want to do yoga"})
+        assert response.status_code == 200
+
+        session_id = response.json().get("session_id")
+        assert session_id
+
+        yield session_id
+
+        # Best-effort cleanup; the test itself may already have deleted it
+        await aclient.delete(f"/v1/chat/sessions/{session_id}")
 
     @pytest.fixture
-    def session_ids(self):
-        """Fixture to track created session IDs for cleanup."""
-        return []
+    async def opened_sessions(self, aclient):
+        """Collect the session ids a test opens and delete them afterwards."""
+        session_ids = []
+        yield session_ids
 
-    def test_server_health(self, client):
-        """Test if the app is healthy."""
-        response = client.get("/health")
-        assert response.status_code == 200
-        data = response.json()
-        assert data["status"] == "healthy"
-        assert "service" in data
-        assert "version" in data
+        await asyncio.gather(
+            *(aclient.delete(f"/v1/chat/sessions/{sid}") for sid in session_ids)
+        )
 
-    def test_basic_chat(self, client, session_ids):
+    async def test_basic_chat(self, aclient, opened_sessions):
         """Test basic chat functionality."""
         # Test simple chat message
         chat_data = {"message": "I want to do yoga"}
 
-        response = client.post("/v1/chat", json=chat_data)
+        response = await aclient.post("/v1/chat", json=chat_data)
         assert response.status_code == 200
 
         data = response.json()
+        if data.get("session_id"):
+            opened_sessions.append(data["session_id"])
 
         # Validate response structure
         assert "session_id" in data
@@ -62,7 +103,6 @@ class TestChatIntegration:
 
         session_id = data.get("session_id")
         assert session_id
-        session_ids.append(session_id)
 
         # Check for outfit recommendations
         if data.get("outfits"):
@@ -70,20 +110,15 @@ class TestChatIntegration:
             assert "title" in outfit
             assert "score" in outfit
 
-        return session_id
-
-    def test_chat_with_session_id(self, client, session_ids):
+    async def test_chat_with_session_id(self, aclient, chat_session):
         """Test chat with existing session ID."""
-        if not session_ids:
-            pytest.skip("No session ID available from previous test")
-
-        session_id = session_ids[0]
+        session_id = chat_session
         chat_data = {
             "session_id": session_id,
             "message": "What about business meeting outfit?",
         }
 
-        response = client.post("/v1/chat", json=chat_data)
+        response = await aclient.post("/v1/chat", json=chat_data)
         assert response.status_code == 200
 
         data = response.json()
@@ -92,35 +127,24 @@ class TestChatIntegration:
         if data.get("replies"):
             assert len(data["replies"]) > 0
 
-    def test_chat_validation_errors(self, client):
+    @pytest.mark.parametrize(
+        "data,expected_status",
+        [
+            ({"message": ""}, 422),
+            ({"session_id": "test"}, 422),
+            ({"session_id": "", "message": "test"}, 422),
+            ({"message": "   "}, 422),
+        ],
+        ids=["empty", "missing", "empty_sid", "whitespace"],
+    )
+    async def test_chat_validation_errors(self, aclient, data, expected_status):
         """Test chat input validation."""
-        test_cases = [
-            {"name": "Empty message", "data": {"message": ""}, "expected_status": 422},
-            {
-                "name": "Missing message",
-                "data": {"session_id": "test"},
-                "expected_status": 422,
-            },
-            {
-                "name": "Empty session_id string",
-                "data": {"session_id": "", "message": "test"},
-                "expected_status": 422,
-            },
-            {
-                "name": "Whitespace only message",
-                "data": {"message": "   "},
-                "expected_status": 422,
-            },
-        ]
-
-        for test_case in test_cases:
-            response = client.post("/v1/chat", json=test_case["data"])
-            assert response.status_code == test_case["expected_status"], \
-                f"Failed for case: {test_case['name']}"
+        response = await aclient.post("/v1/chat", json=data)
+        assert response.status_code == expected_status
 
-    def test_chat_suggestions(self, client):
+    async def test_chat_suggestions(self, aclient):
         """Test chat suggestions endpoint."""
-        response = client.get("/v1/chat/suggestions")
+        response = await aclient.get("/v1/chat/suggestions")
         assert response.status_code == 200
 
         data = response.json()
@@ -137,15 +161,12 @@ class TestChatIntegration:
             for field in required_fields:
                 assert field in suggestion, f"Suggestion missing {field} field"
 
-    def test_session_management(self, client, session_ids):
+    async def test_session_management(self, aclient, chat_session):
         """Test session management endpoints."""
-        if not session_ids:
-            pytest.skip("No session ID available")
-
-        session_id = session_ids[0]
+        session_id = chat_session
 
         # Test list sessions
-        response = client.get("/v1/chat/sessions")
+        response = await aclient.get("/v1/chat/sessions")
         assert response.status_code == 200
 
         data = response.json()
@@ -153,7 +174,7 @@ class TestChatIntegration:
         assert "pagination" in data
 
         # Test get specific session
-        response = client.get(f"/v1/chat/sessions/{session_id}")
+        response = await aclient.get(f"/v1/chat/sessions/{session_id}")
         assert response.status_code == 200
 
         data = response.json()
@@ -168,62 +189,49 @@ class TestChatIntegration:
             assert field in data, f"Session details missing {field} field"
 
         # Test clear session context
-        response = client.post(f"/v1/chat/sessions/{session_id}/clear")
+        response = await aclient.post(f"/v1/chat/sessions/{session_id}/clear")
         assert response.status_code == 200
 
-    def test_conversation_flow(self, client, session_ids):
+    async def test_conversation_flow(self, aclient, chat_session):
         """Test a complete conversation flow."""
-        conversation_steps = [
-            "I need an outfit for yoga",
-            "What about something for a business meeting?",
-            "Show me casual outfits under ฿2000",
-            "I prefer black and white colors",
-            "Any recommendations for summer season?",
+        # Serialize every step up front; the fixture's session is already known
+        bodies = [
+            orjson.dumps({"message": message, "session_id": chat_session})
+            for message in CONVERSATION_STEPS
         ]
 
-        session_id = None
-
-        for i, message in enumerate(conversation_steps):
-            chat_data = {"message": message}
-            if session_id:
-                chat_data["session_id"] = session_id
-
-            response = client.post("/v1/chat", json=chat_data)
-            assert response.status_code == 200, f"Failed at conversation step {i + 1}"
+        for i, body in enumerate(bodies, start=1):
+            response = await aclient.post("/v1/chat", content=body, headers=JSON_HDR)
+            assert response.status_code == 200, f"Failed at conversation step {i}"
 
             data = response.json()
-            if not session_id:
-                session_id = data.get("session_id")
-                if session_id:
-                    session_ids.append(session_id)
+            assert data.get("session_id") == chat_session
 
             # Check for meaningful responses
             has_replies = len(data.get("replies", [])) > 0
             has_outfits = data.get("outfits") is not None
 
-            assert has_replies or has_outfits, f"No content in response for step {i + 1}"
+            assert has_replies or has_outfits, f"No content in response for step {i}"
 
-    def test_fashion_specific_queries(self, client, session_ids):
+    async def test_fashion_specific_queries(self, aclient, opened_sessions):
         """Test fashion-specific chat queries."""
-        fashion_queries = [
-            "I want to look slim",
-            "Beach vacation outfits",
-            "Party dress for Saturday night",
-            "Professional work clothes",
-            "Comfortable sportswear",
-            "Elegant formal wear",
-            "Casual weekend outfits",
-        ]
-
-        for query in fashion_queries:
-            chat_data = {"message": query}
-            response = client.post("/v1/chat", json=chat_data)
+        # Queries are independent, so overlap their round-trips
+        responses = await asyncio.gather(
+            *(
+                aclient.post("/v1/chat", content=body, headers=JSON_HDR)
+                for body in FASHION_BODIES
+            )
+        )
+
+        # Record every opened session before asserting, so all get cleaned up
+        for response in responses:
+            if response.status_code == 200 and response.json().get("session_id"):
+                opened_sessions.append(response.json()["session_id"])
+
+        for query, response in zip(FASHION_QUERIES, responses):
             assert response.status_code == 200, f"Failed for query: {query}"
 
             data = response.json()
-            session_id = data.get("session_id")
-            if session_id and session_id not in session_ids:
-                session_ids.append(session_id)
 
             # Check if we got meaningful responses
             has_replies = len(data.get("replies", [])) > 0
@@ -231,52 +239,65 @@ class TestChatIntegration:
 
             assert has_replies or has_outfits, f"No content for fashion query: {query}"
 
-    def test_error_handling(self, client):
+    async def test_error_handling(self, aclient):
         """Test error handling scenarios."""
         # Test non-existent session
         fake_session_id = str(uuid.uuid4())
-        response = client.get(f"/v1/chat/sessions/{fake_session_id}")
+        response = await aclient.get(f"/v1/chat/sessions/{fake_session_id}")
         assert response.status_code == 404
 
         # Test invalid session ID for deletion
-        response = client.delete(f"/v1/chat/sessions/{fake_session_id}")
+        response = await aclient.delete(f"/v1/chat/sessions/{fake_session_id}")
         assert response.status_code == 404
 
         # Test malformed data
-        response = client.post("/v1/chat", json={"invalid": "data"})
+        response = await aclient.post("/v1/chat", json={"invalid": "data"})
         assert response.status_code == 422
 
-    def test_session_cleanup(self, client, session_ids):
+    async def test_session_cleanup(self, aclient, chat_session):
         """Test session cleanup (delete created sessions)."""
-        for session_id in session_ids:
-            response = client.delete(f"/v1/chat/sessions/{session_id}")
-            assert response.status_code == 200, f"Failed to delete session {session_id}"
+        session_id = chat_session
+
+        response = await aclient.delete(f"/v1/chat/sessions/{session_id}")
+        assert response.status_code == 200, f"Failed to delete session {session_id}"
+
+    async def test_additional_fashion_queries(self, aclient, opened_sessions):
+        """Test additional fashion queries issued concurrently."""
+        responses = await asyncio.gather(
+            *(
+                aclient.post("/v1/chat", content=body, headers=JSON_HDR)
+                for body in ADDITIONAL_BODIES
+            )
+        )
+
+        # Record every opened session before asserting, so all get cleaned up
+        for response in responses:
+            if response.status_code == 200 and response.json().get("session_id"):
+                opened_sessions.append(response.json()["session_id"])
+
+        for query, response in zip(ADDITIONAL_QUERIES, responses):
+            assert response.status_code == 200, f"Failed for query: {query}"
+
+            data = response.json()
+            has_replies = len(data.get("replies", [])) > 0
+            has_outfits = data.get("outfits") is not None
+
+            assert has_replies or has_outfits, f"No content for query: {query}"
 
-    def test_chat_entity_validation(self, client):
+
+@pytest.mark.unit
+@pytest.mark.chat
+class TestChatEntities:
+    """Chat entity validation that does not need the app client."""
+
+    def test_chat_entity_validation(self):
         """Test ChatRequest and ChatResponse entity validation."""
         # Test valid ChatRequest
         try:
-            ChatRequest(session_id="test-123", message="Hello")
+            ChatRequest.model_validate(VALID_CHAT_REQUEST)
         except Exception as e:
             pytest.fail(f"Valid ChatRequest creation failed: {e}")
 
         # Test invalid ChatRequest (empty message)
-        with pytest.raises(ValueError):
-            ChatRequest(session_id="test", message="")
-
-    @pytest.mark.parametrize("query", [
-        "Red dress for date night",
-        "Black suit for interview",
-        "Summer tops under ฿1000",
-    ])
-    def test_parametrized_fashion_queries(self, client, query):
-        """Test additional fashion queries using parametrization."""
-        chat_data = {"message": query}
-        response = client.post("/v1/chat", json=chat_data)
-        assert response.status_code == 200
-
-        data = response.json()
-        has_replies = len(data.get("replies", [])) > 0
-        has_outfits = data.get("outfits") is not None
-
-        assert has_replies or has_outfits, f"No content for parametrized query: {query}"
\ No newline at end of file
+        with pytest.raises(ValidationError):
+            ChatRequest.model_validate(EMPTY_MESSAGE_CHAT_REQUEST)
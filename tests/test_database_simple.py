@@ -5,10 +5,20 @@ This module contains basic tests for database connectivity and schema
 without requiring full application import.
 """
 
+import logging
 import pytest
 import sqlite3
-import json
+import time
 from pathlib import Path
+from typing import Any, Dict, List
+
+from pydantic import TypeAdapter, ValidationError
+
+# Parse and type-check JSON columns in a single pydantic-core call
+SizeRangeAdapter = TypeAdapter(List[Any])
+AttributesAdapter = TypeAdapter(Dict[str, Any])
+
+logger = logging.getLogger(__name__)
 
 
 @pytest.fixture(scope="module")
@@ -17,6 +27,73 @@ def db_path():
     return Path(__file__).parent.parent / "lookbook.db"
 
 
+@pytest.fixture(scope="module")
+def conn(db_path):
+    """Shared SQLite connection for the module."""
+    connection = sqlite3.connect(str(db_path))
+    # Read-only workload: map pages into memory and keep temp data off disk
+    connection.execute("PRAGMA mmap_size=268435456")
+    connection.execute("PRAGMA cache_size=-65536")
+    connection.execute("PRAGMA temp_store=MEMORY")
+    yield connection
+    connection.close()
+
+
+@pytest.fixture(scope="module")
+def schema_snapshot(conn):
+    """Run the schema and count queries once and cache the results."""
+    cursor = conn.cursor()
+
+    tables = {
+        row[0]
+        for row in cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
+    }
+
+    # Prefer "products", fall back to the legacy "items" table
+    product_table = next((t for t in ("products", "items") if t in tables), None)
+
+    snapshot = {
+        "tables": tables,
+        "product_table": product_table,
+        "products_cols": {},
+        "products_count": None,
+        "count_query_time": None,
+        "sample_items": [],
+        "outfits_count": None,
+        "rules_count": None,
+    }
+
+    if product_table:
+        snapshot["products_cols"] = {
+            col[1]: col[2]
+            for col in cursor.execute(f"PRAGMA table_info({product_table});")
+        }
+
+        snapshot["sample_items"] = cursor.execute(
+            f"SELECT id, sku, title, price, in_stock FROM {product_table} LIMIT 5;"
+        ).fetchall()
+
+    # All row counts in a single statement
+    count_keys = {
+        product_table: "products_count",
+        "outfits": "outfits_count",
+        "rules": "rules_count",
+    }
+    count_tables = [t for t in count_keys if t in tables]
+    if count_tables:
+        subqueries = ", ".join(f"(SELECT COUNT(*) FROM {t})" for t in count_tables)
+        start_time = time.time()
+        row = cursor.execute(f"SELECT {subqueries};").fetchone()
+        elapsed = time.time() - start_time
+
+        for table, count in zip(count_tables, row):
+            snapshot[count_keys[table]] = count
+        if product_table:
+            snapshot["count_query_time"] = elapsed
+
+    return snapshot
+
+
 class TestDatabaseBasics:
     """Test basic database functionality."""
 
@@ -37,14 +114,9 @@ class TestDatabaseBasics:
         assert result[0] == 1, "Basic database query failed"
         conn.close()
 
-    def test_required_tables_exist(self, db_path):
+    def test_required_tables_exist(self, schema_snapshot):
         """Test that all required tables exist in the database."""
-        conn = sqlite3.connect(str(db_path))
-        cursor = conn.cursor()
-
-        # Get list of tables
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-        tables = [table[0] for table in cursor.fetchall()]
+        tables = schema_snapshot["tables"]
 
         # Check required tables exist
         required_tables = [
@@ -60,39 +132,11 @@ class TestDatabaseBasics:
             if table not in tables:
                 missing_tables.append(table)
 
-        conn.close()
-
         assert not missing_tables, f"Missing required tables: {missing_tables}"
 
-    def test_items_table_schema(self, db_path):
+    def test_items_table_schema(self, schema_snapshot):
         """Test that items table has correct schema."""
-        conn = sqlite3.connect(str(db_path))
-        cursor = conn.cursor()
-
-        # Get table schema
-        cursor.execute("PRAGMA table_info(products);")
-        columns = {col[1]: col[2] for col in cursor.fetchall()}
-
-        # Check required columns exist
-        required_columns = [
-            "id",
-            "sku",
-            "title",
-            "price",
-            "size_range",
-            "image_key",
-            "attributes",
-            "in_stock",
-            "created_at",
-            "updated_at",
-        ]
-
-        missing_columns = []
-        for column in required_columns:
-            if column not in columns:
-                missing_columns.append(column)
-
-        conn.close()
+        columns = schema_snapshot["products_cols"]
 
         # For backward compatibility, check if products table has the equivalent columns
         expected_columns = ['id', 'sku', 'title', 'price', 'size_range', 'image_key', 'attributes', 'in_stock', 'created_at', 'updated_at']
@@ -103,78 +147,44 @@ class TestDatabaseBasics:
             f"Missing required columns in items table: {missing_columns}"
         )
 
-    def test_items_table_has_data(self, db_path):
+    def test_items_table_has_data(self, schema_snapshot):
         """Test that items table contains some data."""
-        conn = sqlite3.connect(str(db_path))
-        cursor = conn.cursor()
-
-        # Count items
-        # Try both table names for backward compatibility
-        try:
-            cursor.execute("SELECT COUNT(*) FROM products;")
-            result = cursor.fetchone()
-            item_count = result[0] if result else 0
-        except sqlite3.OperationalError:
-            cursor.execute("SELECT COUNT(*) FROM items;")
-            result = cursor.fetchone()
-            item_count = result[0] if result else 0
+        item_count = schema_snapshot["products_count"]
+        assert item_count is not None, "Neither products nor items table exists"
 
-        print(f"\nItems in database: {item_count}")
+        logger.debug("Items in database: %s", item_count)
 
         # Get sample data if exists
-        if item_count > 0:
-            try:
-                cursor.execute("SELECT id, sku, title, price FROM products LIMIT 3;")
-                items = cursor.fetchall()
-
-                print("Sample items:")
-                for item in items:
-                    print(
-                        f"  ID: {item[0]}, SKU: {item[1]}, Title: {item[2]}, Price: ${item[3]}"
-                    )
-            except sqlite3.OperationalError:
-                cursor.execute("SELECT id, sku, title, price FROM items LIMIT 3;")
-                items = cursor.fetchall()
-
-                print("Sample items:")
-                for item in items:
-                    print(
-                        f"  ID: {item[0]}, SKU: {item[1]}, Title: {item[2]}, Price: ${item[3]}"
-                    )
-
-        conn.close()
+        for item in schema_snapshot["sample_items"][:3]:
+            logger.debug(
+                "Sample item ID: %s, SKU: %s, Title: %s, Price: $%s", *item[:4]
+            )
 
         # Don't fail if no data, just report
         assert item_count >= 0, "Item count should be non-negative"
 
-    def test_json_fields_valid(self, db_path):
+    def test_json_fields_valid(self, conn, schema_snapshot):
         """Test that JSON fields in database contain valid JSON."""
-        conn = sqlite3.connect(str(db_path))
-        cursor = conn.cursor()
+        product_table = schema_snapshot["product_table"]
+        assert product_table, "Neither products nor items table exists"
 
-        # Check if we have any items with JSON fields
-        # Try both table names
-        try:
-            cursor.execute("SELECT id, size_range, attributes FROM products LIMIT 5;")
-            items = cursor.fetchall()
-        except sqlite3.OperationalError:
-            cursor.execute("SELECT id, size_range, attributes FROM items LIMIT 5;")
-            items = cursor.fetchall()
-        items = cursor.fetchall()
+        # Check if we have any items with JSON fields, streaming rows in chunks
+        cursor = conn.cursor()
+        cursor.arraysize = 200
+        cursor.execute(
+            f"SELECT id, size_range, attributes FROM {product_table} LIMIT 1000;"
+        )
 
         json_errors = []
 
-        for item in items:
+        for item in cursor:
             item_id, size_range, attributes = item
 
             # Test size_range JSON
             if size_range:
                 try:
-                    parsed_sizes = json.loads(size_range)
-                    assert isinstance(parsed_sizes, list), (
-                        f"size_range should be a list for item {item_id}"
-                    )
-                except json.JSONDecodeError as e:
+                    SizeRangeAdapter.validate_json(size_range)
+                except ValidationError as e:
                     json_errors.append(
                         f"Invalid size_range JSON for item {item_id}: {e}"
                     )
@@ -182,17 +192,12 @@ class TestDatabaseBasics:
             # Test attributes JSON
             if attributes:
                 try:
-                    parsed_attrs = json.loads(attributes)
-                    assert isinstance(parsed_attrs, dict), (
-                        f"attributes should be a dict for item {item_id}"
-                    )
-                except json.JSONDecodeError as e:
+                    AttributesAdapter.validate_json(attributes)
+                except ValidationError as e:
                     json_errors.append(
                         f"Invalid attributes JSON for item {item_id}: {e}"
                     )
 
-        conn.close()
-
         assert not json_errors, f"JSON parsing errors: {json_errors}"
 
     def test_database_integrity(self, db_path):
@@ -215,65 +220,43 @@ class TestDatabaseBasics:
         )
         assert not fk_violations, f"Foreign key violations found: {fk_violations}"
 
-    def test_database_performance(self, db_path):
+    def test_database_performance(self, schema_snapshot):
         """Test basic database performance."""
-        import time
-
-        conn = sqlite3.connect(str(db_path))
-        cursor = conn.cursor()
-
-        # Time a simple query
-        start_time = time.time()
-        # Try both table names
-        try:
-            cursor.execute("SELECT COUNT(*) FROM products;")
-            result = cursor.fetchone()
-        except sqlite3.OperationalError:
-            cursor.execute("SELECT COUNT(*) FROM items;")
-            result = cursor.fetchone()
-        end_time = time.time()
+        query_time = schema_snapshot["count_query_time"]
+        assert query_time is not None, "Query should return a valid result from products table"
 
-        query_time = end_time - start_time
-
-        conn.close()
-
-        print(f"\nDatabase query time: {query_time:.4f} seconds")
+        logger.debug("Database query time: %.4f seconds", query_time)
 
         # Query should complete quickly
         assert query_time < 1.0, f"Database query took too long: {query_time:.4f}s"
-        assert result is not None and result[0] is not None, "Query should return a valid result from products table"
+        assert schema_snapshot["products_count"] is not None, "Query should return a valid result from products table"
 
 
 class TestDatabaseContent:
     """Test actual database content and data quality."""
 
-    def test_items_data_quality(self, db_path):
+    def test_items_data_quality(self, conn, schema_snapshot):
         """Test the quality of data in items table."""
-        conn = sqlite3.connect(str(db_path))
-        cursor = conn.cursor()
+        product_table = schema_snapshot["product_table"]
+        assert product_table, "Neither products nor items table exists"
 
-        # Get all items
-        # Try both table names
-        try:
-            cursor.execute("SELECT * FROM products;")
-            items = cursor.fetchall()
-        except sqlite3.OperationalError:
-            cursor.execute("SELECT * FROM items;")
-            items = cursor.fetchall()
-        items = cursor.fetchall()
-
-        if not items:
-            print(
-                "\nNo items found in database - this is expected if ingestion hasn't run yet"
+        item_count = schema_snapshot["products_count"]
+        if not item_count:
+            logger.debug(
+                "No items found in database - this is expected if ingestion hasn't run yet"
             )
-            conn.close()
             return
 
-        print(f"\nFound {len(items)} items in database")
+        logger.debug("Found %s items in database", item_count)
+
+        # Stream all items in chunks rather than materializing the table
+        cursor = conn.cursor()
+        cursor.arraysize = 200
+        cursor.execute(f"SELECT * FROM {product_table};")
 
         data_issues = []
 
-        for item in items:
+        for item in cursor:
             item_id = item[0]
             sku = item[1]
             title = item[2]
@@ -287,70 +270,31 @@ class TestDatabaseContent:
             if price is None or price < 0:
                 data_issues.append(f"Item {item_id} has invalid price: {price}")
 
-        conn.close()
-
         # Report issues but don't fail test (data quality warnings)
         if data_issues:
-            print(f"Data quality issues found: {data_issues}")
+            logger.debug("Data quality issues found: %s", data_issues)
 
         # Only fail on severe issues
         severe_issues = [issue for issue in data_issues if "empty SKU" in issue]
         assert not severe_issues, f"Severe data issues found: {severe_issues}"
 
-    def test_sample_data_display(self, db_path):
+    def test_sample_data_display(self, schema_snapshot):
         """Display sample data from the database for verification."""
-        conn = sqlite3.connect(str(db_path))
-        cursor = conn.cursor()
-
-        print(f"\n{'=' * 60}")
-        print("DATABASE CONTENT SAMPLE")
-        print(f"{'=' * 60}")
-
         # Show items
-        # Try both table names
-        try:
-            cursor.execute("SELECT COUNT(*) FROM products;")
-            result = cursor.fetchone()
-            item_count = result[0] if result else 0
-        except sqlite3.OperationalError:
-            cursor.execute("SELECT COUNT(*) FROM items;")
-            result = cursor.fetchone()
-            item_count = result[0] if result else 0
-        print(f"Items: {item_count}")
-
-        if item_count > 0:
-            # Try both table names
-            try:
-                cursor.execute("SELECT id, sku, title, price, in_stock FROM products LIMIT 5;")
-                items = cursor.fetchall()
-            except sqlite3.OperationalError:
-                cursor.execute("SELECT id, sku, title, price, in_stock FROM items LIMIT 5;")
-                items = cursor.fetchall()
-
-            print("\nSample Items:")
-            print("ID | SKU | Title | Price | In Stock")
-            print("-" * 50)
-            for item in items:
-                in_stock = "Yes" if item[4] else "No"
-                print(
-                    f"{item[0]} | {item[1]} | {item[2][:20]}... | ${item[3]} | {in_stock}"
-                )
-
-        # Show outfits
-        cursor.execute("SELECT COUNT(*) FROM outfits;")
-        result = cursor.fetchone()
-        outfit_count = result[0] if result else 0
-        print(f"\nOutfits: {outfit_count}")
-
-        # Show rules
-        cursor.execute("SELECT COUNT(*) FROM rules;")
-        result = cursor.fetchone()
-        rule_count = result[0] if result else 0
-        print(f"Rules: {rule_count}")
-
-        print(f"{'=' * 60}\n")
-
-        conn.close()
+        item_count = schema_snapshot["products_count"]
+        assert item_count is not None, "Neither products nor items table exists"
+        logger.debug("Items: %s", item_count)
+
+        # ID | SKU | Title | Price | In Stock
+        for item in schema_snapshot["sample_items"]:
+            logger.debug(
+                "%s | %s | %.20s... | $%s | %s",
+                *item[:4],
+                "Yes" if item[4] else "No",
+            )
 
-        # This test always passes - it's just for information
-        assert True
+        # Show outfits and rules
+        assert schema_snapshot["outfits_count"] is not None, "outfits table missing"
+        assert schema_snapshot["rules_count"] is not None, "rules table missing"
+        logger.debug("Outfits: %s", schema_snapshot["outfits_count"])
+        logger.debug("Rules: %s", schema_snapshot["rules_count"])
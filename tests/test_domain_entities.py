@@ -7,8 +7,11 @@ This module contains unit tests for domain entities and validation.
 import pytest
 from datetime import datetime
 from pathlib import Path
+from typing import List
 import sys
 
+from pydantic import TypeAdapter
+
 # Add the project root to Python path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
@@ -36,53 +39,150 @@ from lookbook_mpc.domain.entities import (
     ChatResponse,
 )
 
+# Validate outfit batches in one pydantic-core pass
+_OUTFIT_LIST_ADAPTER = TypeAdapter(List[Outfit])
+
+SIZE_CASES = [
+    ("XS", "XS"),
+    ("S", "S"),
+    ("M", "M"),
+    ("L", "L"),
+    ("XL", "XL"),
+    ("XXL", "XXL"),
+    ("XXXL", "XXXL"),
+    ("PLUS", "PLUS"),
+    ("ONE_SIZE", "ONE_SIZE"),
+    ("PETITE", "PETITE"),
+    ("TALL", "TALL"),
+    ("CUSTOM", "CUSTOM"),
+]
+
+CATEGORY_CASES = [
+    ("TOP", "top"),
+    ("BOTTOM", "bottom"),
+    ("DRESS", "dress"),
+    ("OUTERWEAR", "outerwear"),
+    ("SHOES", "shoes"),
+    ("ACCESSORY", "accessory"),
+]
+
+# Oversized payloads, allocated once at import. Enum members are singletons,
+# so multiplying the size list costs nothing extra.
+_TOO_MANY_SIZES = [Size.S] * 25
+_TOO_MANY_OBJECTIVES = ["obj"] * 15
+_TOO_MANY_OUTFITS = _OUTFIT_LIST_ADAPTER.validate_python(
+    [
+        {"title": f"Test Outfit {i}", "items": [], "score": 0.8, "rationale": "test"}
+        for i in range(25)
+    ]
+)
+# `[{...}] * 15` would alias a single dict 15 times. Pydantic rebuilds every
+# dict on validation either way, so build distinct ones once and keep them in
+# a tuple that no test can mutate.
+_TOO_MANY_REPLIES = tuple({"type": "text", "message": "test"} for _ in range(15))
+
+# Invalid cases are overrides applied on top of the canonical valid kwargs
+INVALID_ITEMS = [
+    ({"price": -10.0}, "price cannot be negative"),
+    ({"sku": ""}, None),
+    ({"size_range": "invalid"}, None),
+    ({"size_range": _TOO_MANY_SIZES}, "size_range cannot have more than 20 sizes"),
+]
+
+INVALID_OUTFITS = [
+    ({"title": ""}, None),
+    ({"intent_tags": "invalid"}, None),
+]
+
+INVALID_OUTFIT_ITEMS = [
+    ({"outfit_id": -1}, None),
+    ({"item_id": -2}, None),
+    ({"item_id": 1}, "outfit_id and item_id cannot be the same"),
+    ({"item_id": "abc"}, "item_id must be an integer"),
+    ({"outfit_id": 1.5}, "outfit_id must be an integer"),
+    ({"item_id": None}, "item_id must be an integer"),
+]
+
+INVALID_RULES = [
+    ({"name": ""}, None),
+    ({"intent": ""}, None),
+    ({"name": "yoga"}, "name and intent cannot be the same"),
+]
+
+INVALID_INTENTS = [
+    ({"intent": ""}, None),
+    ({"budget_max": -10.0}, "budget_max must be positive when specified"),
+    ({"objectives": "invalid"}, None),
+    ({"objectives": _TOO_MANY_OBJECTIVES}, "objectives cannot have more than 10 items"),
+]
+
+INVALID_RECOMMENDATION_REQUESTS = [
+    ({"text_query": ""}, None),
+    ({"text_query": "test", "preferences": "invalid"}, None),
+]
+
+INVALID_RECOMMENDATION_RESPONSES = [
+    ({"constraints_used": "invalid", "outfits": []}, None),
+    ({"constraints_used": {}, "outfits": "invalid"}, None),
+    (
+        {"constraints_used": {}, "outfits": _TOO_MANY_OUTFITS},
+        "cannot return more than 20 outfits",
+    ),
+]
+
+INVALID_INGEST_REQUESTS = [
+    ({"limit": 0}, None),
+    ({"limit": 1001}, None),
+]
+
+INVALID_INGEST_RESPONSES = [
+    ({"status": "", "items_processed": 0}, None),
+    ({"status": "completed", "items_processed": -1}, None),
+]
+
+INVALID_CHAT_REQUESTS = [
+    ({"message": ""}, None),
+    (
+        {"session_id": "", "message": "test"},
+        "session_id cannot be empty string",
+    ),
+]
+
+INVALID_CHAT_RESPONSES = [
+    ({"session_id": "", "replies": []}, None),
+    ({"session_id": "test", "replies": "invalid"}, None),
+    (
+        {"session_id": "test", "replies": _TOO_MANY_REPLIES},
+        "cannot return more than 10 replies",
+    ),
+    ({"session_id": "test", "replies": [], "outfits": "invalid"}, None),
+]
+
 
 class TestSize:
     """Test Size enum."""
 
-    def test_size_values(self):
+    @pytest.mark.parametrize("name,value", SIZE_CASES)
+    def test_size_values(self, name, value):
         """Test that all expected size values exist."""
-        assert Size.XS == "XS"
-        assert Size.S == "S"
-        assert Size.M == "M"
-        assert Size.L == "L"
-        assert Size.XL == "XL"
-        assert Size.XXL == "XXL"
-        assert Size.XXXL == "XXXL"
-        assert Size.PLUS == "PLUS"
-        assert Size.ONE_SIZE == "ONE_SIZE"
-        assert Size.PETITE == "PETITE"
-        assert Size.TALL == "TALL"
-        assert Size.CUSTOM == "CUSTOM"
+        assert Size[name] == value
 
 
 class TestCategory:
     """Test Category enum."""
 
-    def test_category_values(self):
+    @pytest.mark.parametrize("name,value", CATEGORY_CASES)
+    def test_category_values(self, name, value):
         """Test that all expected category values exist."""
-        assert Category.TOP == "top"
-        assert Category.BOTTOM == "bottom"
-        assert Category.DRESS == "dress"
-        assert Category.OUTERWEAR == "outerwear"
-        assert Category.SHOES == "shoes"
-        assert Category.ACCESSORY == "accessory"
+        assert Category[name] == value
 
 
 class TestItem:
     """Test Item entity."""
 
-    def test_item_creation(self):
+    def test_item_creation(self, valid_item_kwargs):
         """Test creating a valid item."""
-        item = Item(
-            sku="TEST001",
-            title="Test Item",
-            price=29.99,
-            size_range=[Size.S, Size.M, Size.L],
-            image_key="test-image.jpg",
-            attributes={"color": "blue", "material": "cotton"},
-            in_stock=True,
-        )
+        item = Item(**valid_item_kwargs)
 
         assert item.sku == "TEST001"
         assert item.title == "Test Item"
@@ -92,113 +192,65 @@ class TestItem:
         assert item.attributes == {"color": "blue", "material": "cotton"}
         assert item.in_stock is True
 
-    def test_item_validation(self):
+    @pytest.mark.parametrize("kw,msg", INVALID_ITEMS)
+    def test_item_invalid(self, valid_item_kwargs, kw, msg):
         """Test item validation."""
-        # Test negative price
-        with pytest.raises(ValueError, match="price cannot be negative"):
-            Item(
-                sku="TEST001",
-                title="Test",
-                price=-10.0,
-                size_range=[],
-                image_key="test.jpg",
-            )
-
-        # Test empty SKU
-        with pytest.raises(ValueError):
-            Item(sku="", title="Test", price=10.0, size_range=[], image_key="test.jpg")
-
-        # Test invalid size range
-        with pytest.raises(ValueError):
-            Item(
-                sku="TEST001",
-                title="Test",
-                price=10.0,
-                size_range="invalid",
-                image_key="test.jpg",
-            )
-
-        # Test too many sizes
-        with pytest.raises(
-            ValueError, match="size_range cannot have more than 20 sizes"
-        ):
-            Item(
-                sku="TEST001",
-                title="Test",
-                price=10.0,
-                size_range=[Size.S] * 25,
-                image_key="test.jpg",
-            )
+        with pytest.raises(ValueError, match=msg):
+            Item(**{**valid_item_kwargs, **kw})
 
 
 class TestOutfit:
     """Test Outfit entity."""
 
-    def test_outfit_creation(self):
+    def test_outfit_creation(self, valid_outfit_kwargs):
         """Test creating a valid outfit."""
-        outfit = Outfit(
-            title="Summer Casual",
-            intent_tags={"occasion": "casual", "season": "summer"},
-            rationale="Perfect for warm weather",
-            score=0.85,
-        )
+        outfit = Outfit(**valid_outfit_kwargs)
 
         assert outfit.title == "Summer Casual"
         assert outfit.intent_tags == {"occasion": "casual", "season": "summer"}
         assert outfit.rationale == "Perfect for warm weather"
         assert outfit.score == 0.85
 
-    def test_outfit_validation(self):
+    @pytest.mark.parametrize("kw,msg", INVALID_OUTFITS)
+    def test_outfit_invalid(self, valid_outfit_kwargs, kw, msg):
         """Test outfit validation."""
-        # Test empty title
-        with pytest.raises(ValueError):
-            Outfit(title="", intent_tags={}, rationale="test")
-
-        # Test invalid intent_tags
-        with pytest.raises(ValueError):
-            Outfit(title="Test", intent_tags="invalid", rationale="test")
+        with pytest.raises(ValueError, match=msg):
+            Outfit(**{**valid_outfit_kwargs, **kw})
 
 
 class TestOutfitItem:
     """Test OutfitItem entity."""
 
-    def test_outfit_item_creation(self):
+    def test_outfit_item_creation(self, valid_outfit_item_kwargs):
         """Test creating a valid outfit item."""
-        outfit_item = OutfitItem(outfit_id=1, item_id=2, role=Role.TOP)
+        outfit_item = OutfitItem(**valid_outfit_item_kwargs)
 
         assert outfit_item.outfit_id == 1
         assert outfit_item.item_id == 2
         assert outfit_item.role == Role.TOP
 
-    def test_outfit_item_validation(self):
-        """Test outfit item validation."""
-        # Test negative outfit_id
-        with pytest.raises(ValueError):
-            OutfitItem(outfit_id=-1, item_id=2, role=Role.TOP)
+    def test_outfit_item_coerces_ids(self, valid_outfit_item_kwargs):
+        """Test that numeric strings and integral floats are coerced to int ids."""
+        outfit_item = OutfitItem(
+            **{**valid_outfit_item_kwargs, "outfit_id": "1", "item_id": 2.0}
+        )
 
-        # Test negative item_id
-        with pytest.raises(ValueError):
-            OutfitItem(outfit_id=1, item_id=-2, role=Role.TOP)
+        assert (outfit_item.outfit_id, outfit_item.item_id) == (1, 2)
+        assert type(outfit_item.outfit_id) is int
 
-        # Test same outfit and item ID
-        with pytest.raises(
-            ValueError, match="outfit_id and item_id cannot be the same"
-        ):
-            OutfitItem(outfit_id=1, item_id=1, role=Role.TOP)
+    @pytest.mark.parametrize("kw,msg", INVALID_OUTFIT_ITEMS)
+    def test_outfit_item_invalid(self, valid_outfit_item_kwargs, kw, msg):
+        """Test outfit item validation."""
+        with pytest.raises(ValueError, match=msg):
+            OutfitItem(**{**valid_outfit_item_kwargs, **kw})
 
 
 class TestRule:
     """Test Rule entity."""
 
-    def test_rule_creation(self):
+    def test_rule_creation(self, valid_rule_kwargs):
         """Test creating a valid rule."""
-        rule = Rule(
-            name="Yoga Rule",
-            intent="yoga",
-            constraints={"category": ["activewear"], "material": ["stretch"]},
-            priority=5,
-            is_active=True,
-        )
+        rule = Rule(**valid_rule_kwargs)
 
         assert rule.name == "Yoga Rule"
         assert rule.intent == "yoga"
@@ -206,37 +258,19 @@ class TestRule:
         assert rule.priority == 5
         assert rule.is_active is True
 
-    def test_rule_validation(self):
+    @pytest.mark.parametrize("kw,msg", INVALID_RULES)
+    def test_rule_invalid(self, valid_rule_kwargs, kw, msg):
         """Test rule validation."""
-        # Test empty name
-        with pytest.raises(ValueError):
-            Rule(name="", intent="test", constraints={})
-
-        # Test empty intent
-        with pytest.raises(ValueError):
-            Rule(name="Test", intent="", constraints={})
-
-        # Test name and intent same
-        with pytest.raises(ValueError, match="name and intent cannot be the same"):
-            Rule(name="test", intent="test", constraints={})
+        with pytest.raises(ValueError, match=msg):
+            Rule(**{**valid_rule_kwargs, **kw})
 
 
 class TestIntent:
     """Test Intent entity."""
 
-    def test_intent_creation(self):
+    def test_intent_creation(self, valid_intent_kwargs):
         """Test creating a valid intent."""
-        intent = Intent(
-            intent="recommend_outfits",
-            activity="yoga",
-            occasion=Occasion.YOGA,
-            budget_max=50.0,
-            objectives=["slimming"],
-            palette=["dark", "monochrome"],
-            formality="casual",
-            timeframe="this_weekend",
-            size=Size.L,
-        )
+        intent = Intent(**valid_intent_kwargs)
 
         assert intent.intent == "recommend_outfits"
         assert intent.activity == "yoga"
@@ -248,27 +282,11 @@ class TestIntent:
         assert intent.timeframe == "this_weekend"
         assert intent.size == Size.L
 
-    def test_intent_validation(self):
+    @pytest.mark.parametrize("kw,msg", INVALID_INTENTS)
+    def test_intent_invalid(self, valid_intent_kwargs, kw, msg):
         """Test intent validation."""
-        # Test empty intent
-        with pytest.raises(ValueError):
-            Intent(intent="")
-
-        # Test negative budget
-        with pytest.raises(
-            ValueError, match="budget_max must be positive when specified"
-        ):
-            Intent(intent="test", budget_max=-10.0)
-
-        # Test invalid objectives
-        with pytest.raises(ValueError):
-            Intent(intent="test", objectives="invalid")
-
-        # Test too many objectives
-        with pytest.raises(
-            ValueError, match="objectives cannot have more than 10 items"
-        ):
-            Intent(intent="test", objectives=["obj"] * 15)
+        with pytest.raises(ValueError, match=msg):
+            Intent(**{**valid_intent_kwargs, **kw})
 
 
 class TestVisionAttributes:
@@ -330,15 +348,11 @@ class TestRecommendationRequest:
         assert request.week == "2025-W40"
         assert request.preferences == {"palette": ["dark"]}
 
-    def test_recommendation_request_validation(self):
+    @pytest.mark.parametrize("kw,msg", INVALID_RECOMMENDATION_REQUESTS)
+    def test_recommendation_request_invalid(self, kw, msg):
         """Test recommendation request validation."""
-        # Test empty text_query
-        with pytest.raises(ValueError):
-            RecommendationRequest(text_query="")
-
-        # Test invalid preferences
-        with pytest.raises(ValueError):
-            RecommendationRequest(text_query="test", preferences="invalid")
+        with pytest.raises(ValueError, match=msg):
+            RecommendationRequest(**kw)
 
 
 class TestRecommendationResponse:
@@ -358,23 +372,11 @@ class TestRecommendationResponse:
         assert len(response.outfits) == 1
         assert response.request_id == "test123"
 
-    def test_recommendation_response_validation(self):
+    @pytest.mark.parametrize("kw,msg", INVALID_RECOMMENDATION_RESPONSES)
+    def test_recommendation_response_invalid(self, kw, msg):
         """Test recommendation response validation."""
-        # Test invalid constraints_used
-        with pytest.raises(ValueError):
-            RecommendationResponse(constraints_used="invalid", outfits=[])
-
-        # Test invalid outfits
-        with pytest.raises(ValueError):
-            RecommendationResponse(constraints_used={}, outfits="invalid")
-
-        # Test too many outfits
-        with pytest.raises(ValueError, match="cannot return more than 20 outfits"):
-            outfits = [
-                Outfit(title=f"Test Outfit {i}", items=[], score=0.8, rationale="test")
-                for i in range(25)
-            ]
-            RecommendationResponse(constraints_used={}, outfits=outfits)
+        with pytest.raises(ValueError, match=msg):
+            RecommendationResponse(**kw)
 
 
 class TestIngestRequest:
@@ -387,14 +389,11 @@ class TestIngestRequest:
         assert request.limit == 100
         assert isinstance(request.since, datetime)
 
-    def test_ingest_request_validation(self):
+    @pytest.mark.parametrize("kw,msg", INVALID_INGEST_REQUESTS)
+    def test_ingest_request_invalid(self, kw, msg):
         """Test ingest request validation."""
-        # Test invalid limit
-        with pytest.raises(ValueError):
-            IngestRequest(limit=0)
-
-        with pytest.raises(ValueError):
-            IngestRequest(limit=1001)
+        with pytest.raises(ValueError, match=msg):
+            IngestRequest(**kw)
 
 
 class TestIngestResponse:
@@ -410,15 +409,11 @@ class TestIngestResponse:
         assert response.items_processed == 50
         assert response.request_id == "ingest_123"
 
-    def test_ingest_response_validation(self):
+    @pytest.mark.parametrize("kw,msg", INVALID_INGEST_RESPONSES)
+    def test_ingest_response_invalid(self, kw, msg):
         """Test ingest response validation."""
-        # Test empty status
-        with pytest.raises(ValueError):
-            IngestResponse(status="", items_processed=0)
-
-        # Test negative items_processed
-        with pytest.raises(ValueError):
-            IngestResponse(status="completed", items_processed=-1)
+        with pytest.raises(ValueError, match=msg):
+            IngestResponse(**kw)
 
 
 class TestChatRequest:
@@ -433,15 +428,11 @@ class TestChatRequest:
         assert request.session_id == "session_123"
         assert request.message == "Hello, I need help finding an outfit"
 
-    def test_chat_request_validation(self):
+    @pytest.mark.parametrize("kw,msg", INVALID_CHAT_REQUESTS)
+    def test_chat_request_invalid(self, kw, msg):
         """Test chat request validation."""
-        # Test empty message
-        with pytest.raises(ValueError):
-            ChatRequest(message="")
-
-        # Test empty session_id
-        with pytest.raises(ValueError, match="session_id cannot be empty string"):
-            ChatRequest(session_id="", message="test")
+        with pytest.raises(ValueError, match=msg):
+            ChatRequest(**kw)
 
 
 class TestChatResponse:
@@ -469,21 +460,8 @@ class TestChatResponse:
         assert len(response.outfits) == 1
         assert response.request_id == "chat_123"
 
-    def test_chat_response_validation(self):
+    @pytest.mark.parametrize("kw,msg", INVALID_CHAT_RESPONSES)
+    def test_chat_response_invalid(self, kw, msg):
         """Test chat response validation."""
-        # Test empty session_id
-        with pytest.raises(ValueError):
-            ChatResponse(session_id="", replies=[])
-
-        # Test invalid replies
-        with pytest.raises(ValueError):
-            ChatResponse(session_id="test", replies="invalid")
-
-        # Test too many replies
-        with pytest.raises(ValueError, match="cannot return more than 10 replies"):
-            replies = [{"type": "text", "message": "test"}] * 15
-            ChatResponse(session_id="test", replies=replies)
-
-        # Test invalid outfits
-        with pytest.raises(ValueError):
-            ChatResponse(session_id="test", replies=[], outfits="invalid")
+        with pytest.raises(ValueError, match=msg):
+            ChatResponse(**kw)
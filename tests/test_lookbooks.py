@@ -8,15 +8,42 @@ from unittest.mock import Mock, patch
 from lookbook_mpc.api.routers.lookbooks import router
 
 
-@pytest.fixture
-def mock_db_connection():
-    """Mock database connection."""
+@pytest.fixture(scope="module")
+def patched_db_cursor():
+    """Patch the database connection once for the whole module."""
     with patch('lookbook_mpc.api.routers.lookbooks.get_db_connection') as mock_conn:
         mock_cursor = Mock()
         mock_conn.return_value.cursor.return_value = mock_cursor
         yield mock_cursor
 
 
+@pytest.fixture
+def mock_db_connection(patched_db_cursor):
+    """Mock database cursor, reset so no state leaks between tests."""
+    patched_db_cursor.reset_mock(return_value=True, side_effect=True)
+    return patched_db_cursor
+
+
+@pytest.fixture(scope="module")
+def sample_lookbook_row():
+    """Canonical lookbooks table row; read-only, copy before changing."""
+    return {
+        'id': 'test-id',
+        'slug': 'test-slug',
+        'title': 'Test Lookbook',
+        'description': 'Test description',
+        'cover_image_key': 'test.jpg',
+        'is_active': True,
+        'akeneo_lookbook_id': 'akeneo-123',
+        'akeneo_score': 85.5,
+        'akeneo_last_update': '2025-01-01T00:00:00',
+        'akeneo_sync_status': 'linked',
+        'akeneo_last_error': None,
+        'created_at': '2025-01-01T00:00:00',
+        'updated_at': '2025-01-01T00:00:00'
+    }
+
+
 def test_get_lookbooks_empty(mock_db_connection):
     """Test getting lookbooks when none exist."""
     mock_db_connection.fetchall.return_value = []
@@ -26,22 +53,16 @@ def test_get_lookbooks_empty(mock_db_connection):
     assert mock_db_connection.fetchall.called
 
 
-def test_create_lookbook(mock_db_connection):
+def test_create_lookbook(mock_db_connection, sample_lookbook_row):
     """Test creating a lookbook."""
     mock_db_connection.fetchone.return_value = {
-        'id': 'test-id',
-        'slug': 'test-slug',
-        'title': 'Test Lookbook',
+        **sample_lookbook_row,
         'description': None,
         'cover_image_key': None,
-        'is_active': True,
         'akeneo_lookbook_id': None,
         'akeneo_score': None,
         'akeneo_last_update': None,
         'akeneo_sync_status': 'never',
-        'akeneo_last_error': None,
-        'created_at': '2025-01-01T00:00:00',
-        'updated_at': '2025-01-01T00:00:00'
     }
 
     # Verify mock returns expected data
@@ -50,34 +71,14 @@ def test_create_lookbook(mock_db_connection):
     assert result['title'] == 'Test Lookbook'
 
 
-def test_lookbook_model_from_db():
+def test_lookbook_model_from_db(sample_lookbook_row):
     """Test Lookbook model creation from database data."""
     from lookbook_mpc.api.routers.lookbooks import Lookbook
 
-    db_data = {
-        'id': 'test-id',
-        'slug': 'test-slug',
-        'title': 'Test Lookbook',
-        'description': 'Test description',
-        'cover_image_key': 'test.jpg',
-        'is_active': True,
-        'akeneo_lookbook_id': 'akeneo-123',
-        'akeneo_score': 85.5,
-        'akeneo_last_update': '2025-01-01T00:00:00',
-        'akeneo_sync_status': 'linked',
-        'akeneo_last_error': None,
-        'created_at': '2025-01-01T00:00:00',
-        'updated_at': '2025-01-01T00:00:00'
-    }
-
-    lookbook = Lookbook.from_db(db_data)
+    lookbook = Lookbook.from_db(sample_lookbook_row)
 
     assert lookbook.id == 'test-id'
     assert lookbook.title == 'Test Lookbook'
     assert lookbook.akeneo_score == 85.5
     assert lookbook.akeneo_sync_status == 'linked'
     assert '2025-01-01T00:00:00' in lookbook.created_at
-
-
-if __name__ == '__main__':
-    pytest.main([__file__])
\ No newline at end of file
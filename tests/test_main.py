@@ -2,6 +2,7 @@
 Basic tests for the Lookbook-MPC application setup.
 """
 
+import asyncio
 import pytest
 from pathlib import Path
 import sys
@@ -10,128 +11,78 @@ import sys
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from fastapi.testclient import TestClient
-from main import app
 
-client = TestClient(app)
+async def test_smoke_endpoints(aclient):
+    """Test the health, readiness, docs and error endpoints concurrently."""
+    health, ready, docs, openapi, redoc, missing = await asyncio.gather(
+        aclient.get("/health"),
+        aclient.get("/ready"),
+        aclient.get("/docs"),
+        aclient.get("/openapi.json"),
+        aclient.get("/redoc"),
+        aclient.get("/invalid-endpoint"),
+    )
 
-
-def test_root_endpoint():
-    """Test the root endpoint."""
-    response = client.get("/", headers={"accept": "application/json"})
-    assert response.status_code == 200
-    data = response.json()
-    assert data["service"] == "lookbook-mpc"
-    assert data["version"] == "0.1.0"
-    assert "description" in data
-    assert "docs" in data
-    assert "health" in data
-
-
-def test_health_endpoint():
-    """Test the health check endpoint."""
-    response = client.get("/health")
-    assert response.status_code == 200
-    data = response.json()
+    assert health.status_code == 200
+    data = health.json()
     assert data["status"] == "healthy"
     assert data["service"] == "lookbook-mpc"
     assert data["version"] == "0.1.0"
 
-
-def test_readiness_endpoint():
-    """Test the readiness check endpoint."""
-    response = client.get("/ready")
     # Can be healthy or not depending on service availability
-    assert response.status_code in [200, 503]
-    data = response.json()
+    assert ready.status_code in [200, 503]
+    data = ready.json()
     assert "status" in data
     assert "checks" in data
     assert "timestamp" in data
 
+    assert docs.status_code == 200
+    assert "text/html" in docs.headers["content-type"]
+    assert redoc.status_code == 200
+    assert "text/html" in redoc.headers["content-type"]
 
-def test_api_docs_endpoint():
-    """Test that API documentation is accessible."""
-    response = client.get("/docs")
-    assert response.status_code == 200
-    assert "text/html" in response.headers["content-type"]
+    assert openapi.status_code == 200
+    assert "application/json" in openapi.headers["content-type"]
 
-
-def test_openapi_endpoint():
-    """Test that OpenAPI specification is accessible."""
-    response = client.get("/openapi.json")
-    assert response.status_code == 200
-    data = response.json()
-    assert data["openapi"] == "3.1.0"
-    assert data["info"]["title"] == "Lookbook-MPC"
-    assert data["info"]["version"] == "0.1.0"
+    assert missing.status_code == 404
 
 
-def test_redoc_endpoint():
-    """Test that ReDoc documentation is accessible."""
-    response = client.get("/redoc")
-    assert response.status_code == 200
-    assert "text/html" in response.headers["content-type"]
+def test_openapi_schema(openapi_schema):
+    """Test the OpenAPI specification contents."""
+    assert openapi_schema["openapi"] == "3.1.0"
+    assert openapi_schema["info"]["title"] == "Lookbook-MPC"
+    assert openapi_schema["info"]["version"] == "0.1.0"
 
 
-def test_cors_headers():
-    """Test that CORS headers are present."""
-    response = client.get("/")
-    # CORS headers may not be present for same-origin requests in test client
-    # Just check that the response is successful
-    assert response.status_code == 200
-    # Test passes if we got a successful response
-    pass
-
-
-def test_request_id_header():
-    """Test that request ID is returned in response headers."""
-    response = client.get("/")
-    assert "x-request-id" in response.headers
-    request_id = response.headers["x-request-id"]
-    assert len(request_id) > 0  # Should be a valid UUID
-
-
-def test_ingest_router_exists():
-    """Test that ingest router is properly mounted."""
-    # Check if ingest endpoints exist
-    response = client.get("/v1/ingest/stats")
-    assert response.status_code == 200
-
-
-def test_recommendation_router_exists():
-    """Test that recommendation router is properly mounted."""
-    # Check if recommendation endpoints exist
-    response = client.get("/v1/recommendations/constraints")
-    assert response.status_code == 200
-
-
-def test_chat_router_exists():
-    """Test that chat router is properly mounted."""
-    # Check if chat endpoints exist
-    response = client.get("/v1/chat/suggestions")
+def test_root_endpoint_headers(client):
+    """Test the root endpoint body and response headers in one request."""
+    response = client.get("/", headers={"accept": "application/json"})
     assert response.status_code == 200
 
+    data = response.json()
+    assert data["service"] == "lookbook-mpc"
+    assert data["version"] == "0.1.0"
+    assert "description" in data
+    assert "docs" in data
+    assert "health" in data
 
-def test_images_router_exists():
-    """Test that images router is properly mounted."""
-    # Check if images endpoints exist
-    response = client.head("/v1/images/test.jpg")
-    # This should return 404 (not found) but the endpoint should exist
-    assert response.status_code in [404, 200]
-
-
-def test_structured_logging():
-    """Test that structured logging is working."""
-    # This is a basic test - in real implementation, you'd capture logs
-    response = client.get("/health")
-    assert response.status_code == 200
+    # CORS headers may not be present for same-origin requests in test client,
+    # but the request ID middleware must always tag the response
+    request_id = response.headers.get("x-request-id")
+    assert request_id  # Should be a valid UUID
 
 
-def test_error_handling():
-    """Test that error handling works properly."""
-    # Test with invalid endpoint
-    response = client.get("/invalid-endpoint")
-    assert response.status_code == 404
+def test_routers_mounted(app):
+    """Test that the ingest, recommendation, chat and images routers are mounted."""
+    # Introspect the route table instead of round-tripping each endpoint
+    paths = {route.path for route in app.routes}
+    for path in (
+        "/v1/ingest/stats",
+        "/v1/recommendations/constraints",
+        "/v1/chat/suggestions",
+        "/v1/images/{image_key}",
+    ):
+        assert path in paths, f"Route {path} is not mounted"
 
 
 def test_environment_variables():
@@ -146,12 +97,13 @@ def test_environment_variables():
         "S3_BASE_URL",
     ]
 
-    # Check if environment variables are accessible (they might be empty in test)
-    for var in required_vars:
-        assert var in os.environ or True  # Allow missing in test environment
+    # They might be missing in a bare test environment
+    missing = [var for var in required_vars if var not in os.environ]
+    if missing:
+        pytest.skip(f"missing env: {missing}")
 
 
-def test_fastapi_app_creation():
+def test_fastapi_app_creation(app):
     """Test that FastAPI app is created properly."""
     assert app is not None
     assert app.title == "Lookbook-MPC"
@@ -159,17 +111,14 @@ def test_fastapi_app_creation():
     assert app.description is not None
 
 
-def test_middleware_configuration():
+def test_middleware_configuration(app, client):
     """Test that middleware is properly configured."""
-    # Check CORS middleware
-    # Check middleware configuration differently
+    # Starlette builds the middleware stack on the first request it serves,
+    # so make one here instead of relying on earlier tests in this worker
+    client.get("/health")
     assert app.middleware_stack is not None
 
     # Check request ID middleware
     # Check that CORS middleware is configured
     middleware_names = [middleware.cls.__name__ for middleware in app.user_middleware]
     assert "CORSMiddleware" in middleware_names
-
-
-if __name__ == "__main__":
-    pytest.main([__file__])
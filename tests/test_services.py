@@ -4,6 +4,7 @@ Services Tests
 This module contains unit tests for services (rules engine, recommender).
 """
 
+import numpy as np
 import pytest
 from pathlib import Path
 import sys
@@ -17,8 +18,8 @@ from lookbook_mpc.domain.entities import (
     Size, Category, Material, Pattern, Season, Occasion, Fit, Role,
     VisionAttributes
 )
-from lookbook_mpc.services.rules import RulesEngine
-from lookbook_mpc.services.recommender import OutfitRecommender
+from lookbook_mpc.services.rules import RulesEngine, build_item_columns
+from lookbook_mpc.services.recommender import ItemColumns, OutfitRecommender
 
 
 class TestRulesEngine:
@@ -95,6 +96,64 @@ class TestRulesEngine:
         assert len(filtered_items) == 1
         assert filtered_items[0]["id"] == 1  # Only yoga top should match
 
+    def test_apply_unregistered_rules_to_items(self):
+        """Test applying an ad-hoc rules dict that was never registered."""
+        items = [
+            {"id": 1, "price": 40.0, "attributes": {"vision_attributes": {"pattern": "plain"}}},
+            {"id": 2, "price": 40.0, "attributes": {"vision_attributes": {"pattern": "large_print"}}},
+            {"id": 3, "price": 400.0, "attributes": {"vision_attributes": {"pattern": "plain"}}},
+        ]
+        rules = {
+            "name": "Ad-hoc Rule",
+            "constraints": {"pattern": ["plain", "large_print"]},
+            "excluded_patterns": ["large_print"],
+            "budget_range": [10, 100],
+        }
+
+        filtered_items = self.rules_engine.apply_rules_to_items(items, rules)
+
+        assert [item["id"] for item in filtered_items] == [1]
+        assert filtered_items[0]["rule_score"] == 0.3
+
+    def test_apply_rules_keeps_items_with_unencodable_values(self):
+        """Test that a bad value only fails rules constraining that attribute."""
+        items = [
+            {"id": 1, "price": "n/a", "attributes": {"vision_attributes": {
+                "category": "top", "material": "cotton", "color": ["black", "white"]}}},
+            {"id": 2, "price": 40.0, "attributes": {"vision_attributes": {
+                "category": "top", "material": "cotton", "color": "black"}}},
+        ]
+
+        casual = self.rules_engine.apply_rules_to_items(
+            items, self.rules_engine.get_rules_for_intent("casual")
+        )
+        slimming = self.rules_engine.apply_rules_to_items(
+            items, self.rules_engine.get_rules_for_intent("slimming")
+        )
+        dinner = self.rules_engine.apply_rules_to_items(
+            items, self.rules_engine.get_rules_for_intent("dinner")
+        )
+
+        assert [item["id"] for item in casual] == [1, 2]
+        assert [item["id"] for item in slimming] == [2]
+        assert [item["id"] for item in dinner] == [2]
+
+    def test_apply_rules_vectorized(self):
+        """Test columnar rule filtering returns indices ordered by score."""
+        items = [
+            {"id": 1, "attributes": {"vision_attributes": {"category": "dress"}}},
+            {"id": 2, "attributes": {"vision_attributes": {"category": "top"}}},
+            {"id": 3, "attributes": {"vision_attributes": {"category": "top", "material": "nylon"}}},
+        ]
+        columns = build_item_columns(items)
+
+        indices, scores = self.rules_engine.apply_rules_vectorized(
+            columns, self.rules_engine.get_rules_for_intent("yoga")
+        )
+
+        assert indices.tolist() == [2, 1]
+        assert scores.tolist() == [0.5, 0.3]
+
     def test_add_custom_rule(self):
         """Test adding a custom rule."""
         custom_rule = {
@@ -115,6 +174,30 @@ class TestRulesEngine:
         assert rules["name"] == "Custom Test Rule"
         assert "accessory" in rules["constraints"]["category"]
 
+    def test_add_custom_rule_invalidates_cached_lookup(self):
+        """Test that a cached fallback lookup is dropped when a rule is added."""
+        assert self.rules_engine.get_rules_for_intent("hiking") == (
+            self.rules_engine.get_rules_for_intent("casual")
+        )
+
+        self.rules_engine.add_custom_rule("hiking", {"name": "Hiking Rule"})
+
+        rules = self.rules_engine.get_rules_for_intent("hiking")
+        assert rules["name"] == "Hiking Rule"
+
+    def test_apply_rules_sees_in_place_rule_edits(self):
+        """Test that editing a registered rule dict takes effect on the next call."""
+        items = [
+            {"id": 1, "attributes": {"vision_attributes": {"category": "top"}}},
+            {"id": 2, "attributes": {"vision_attributes": {"category": "shoes"}}},
+        ]
+        yoga_rules = self.rules_engine.get_rules_for_intent("yoga")
+        assert [item["id"] for item in self.rules_engine.apply_rules_to_items(items, yoga_rules)] == [1]
+
+        yoga_rules["excluded_categories"] = ["top"]
+
+        assert self.rules_engine.apply_rules_to_items(items, yoga_rules) == []
+
     def test_get_all_rules(self):
         """Test getting all rules."""
         all_rules = self.rules_engine.get_all_rules()
@@ -196,6 +279,9 @@ class TestOutfitRecommender:
             )
         ]
 
+        # Dump the entities once; tests reuse the dicts
+        self.test_item_dicts = [item.model_dump() for item in self.test_items]
+
     @pytest.mark.asyncio
     async def test_generate_recommendations(self):
         """Test generating outfit recommendations."""
@@ -212,7 +298,7 @@ class TestOutfitRecommender:
         # Generate recommendations
         recommendations = await self.recommender.generate_recommendations(
             intent=intent,
-            candidate_items=[item.dict() for item in self.test_items],
+            candidate_items=self.test_item_dicts,
             max_outfits=3
         )
 
@@ -227,7 +313,7 @@ class TestOutfitRecommender:
         # Generate outfit for yoga theme
         outfit = await self.recommender.generate_outfit_for_theme(
             theme="yoga",
-            items=[item.dict() for item in self.test_items],
+            items=self.test_item_dicts,
             constraints={"occasion": "yoga", "budget_max": 100.0}
         )
 
@@ -236,10 +322,19 @@ class TestOutfitRecommender:
         assert "rationale" in outfit
         assert len(outfit["items"]) >= 1
 
+    @pytest.mark.asyncio
+    async def test_generate_outfit_for_theme_accepts_entities(self):
+        """Test that Item entities are dumped to dicts by the recommender."""
+        outfit = await self.recommender.generate_outfit_for_theme(
+            theme="yoga", items=self.test_items, constraints={}
+        )
+
+        assert outfit is not None
+        assert {item["item_id"] for item in outfit["items"]} == {1, 2}
+
     def test_categorize_items(self):
         """Test item categorization."""
-        # Convert test items to dict format
-        item_dicts = [item.dict() for item in self.test_items]
+        item_dicts = self.test_item_dicts
 
         categorized = self.recommender._categorize_items(item_dicts)
 
@@ -251,6 +346,19 @@ class TestOutfitRecommender:
         assert len(categorized["bottom"]) == 1
         assert len(categorized["accessory"]) == 1
 
+    def test_categorize_items_unknown_category(self):
+        """Test that unknown or missing categories fall back to accessory."""
+        items = [
+            {"price": None, "attributes": {"vision_attributes": {"category": "dress"}}},
+            {"price": None, "attributes": {"vision_attributes": {"category": "hat"}}},
+            {"price": None},
+        ]
+
+        categorized = self.recommender._categorize_items(items)
+
+        assert categorized["dress"] == [items[0]]
+        assert categorized["accessory"] == [items[1], items[2]]
+
     def test_get_required_categories(self):
         """Test getting required categories from rules."""
         # Get yoga rules
@@ -299,6 +407,43 @@ class TestOutfitRecommender:
         assert 0.0 <= bonus <= 0.1
         assert isinstance(bonus, float)
 
+    def test_color_coordination_bonus_palettes(self):
+        """Test the bonus for neutral, two-color and busy palettes."""
+        def outfit(*colors):
+            return {
+                str(i): {"attributes": {"vision_attributes": {"color": color}}}
+                for i, color in enumerate(colors)
+            }
+
+        bonus = self.recommender._calculate_color_coordination_bonus
+        assert bonus(outfit("Black", "navy", "white")) == 0.1
+        assert bonus(outfit("black", "red", "red")) == 0.05
+        assert bonus(outfit("black", "red", "green")) == 0.0
+        assert bonus(outfit("red")) == 0.0
+
+    def test_color_bonus_ignores_unreadable_colors_outside_outfit(self):
+        """Test that one item's unreadable color only zeroes outfits containing it."""
+        columns = ItemColumns.from_items([
+            {"attributes": {"vision_attributes": {"category": "top", "color": "black"}}},
+            {"attributes": {"vision_attributes": {"category": "bottom", "color": "white"}}},
+            {"attributes": {"vision_attributes": {"category": "top", "color": 5}}},
+        ])
+
+        bonus = self.recommender._color_bonus_columns
+        assert bonus(columns, np.array([0, 1])) == 0.1
+        assert bonus(columns, np.array([2, 1])) == 0.0
+
+    def test_color_codes_are_per_batch(self):
+        """Test that color codes restart for every batch of items."""
+        def batch(*colors):
+            return [{"attributes": {"vision_attributes": {"color": color}}} for color in colors]
+
+        ItemColumns.from_items(batch(*(f"color-{i}" for i in range(100))))
+        columns = ItemColumns.from_items(batch("black", "teal", "coral"))
+
+        # Neutrals keep their fixed codes 1-5, new colors follow them
+        assert columns.color.max() == 7
+
     def test_select_best_item_for_category(self):
         """Test selecting best item for category."""
         # Create items with different scores
@@ -317,4 +462,26 @@ class TestOutfitRecommender:
         # The selection logic considers both score and price diversity
         # So it might not always pick the highest score
         assert best_item["rule_score"] in [0.7, 0.8, 0.9]
-        assert best_item in items
\ No newline at end of file
+        assert best_item in items
+
+    def test_select_best_item_for_category_zero_prices(self):
+        """Test that free items fall back to the highest rule score."""
+        items = [
+            {"rule_score": 0.4, "price": 0.0},
+            {"rule_score": 0.9, "price": 0.0},
+        ]
+
+        best_item = self.recommender._select_best_item_for_category(items, "top", {})
+
+        assert best_item is items[1]
+
+    def test_select_best_item_for_category_across_tiles(self):
+        """Test that a well-priced item in a later scoring tile still wins."""
+        # 100 high scorers priced far from the average fill the first tiles
+        items = [{"rule_score": 0.9, "price": 1000.0} for _ in range(100)]
+        items += [{"rule_score": 0.1, "price": 0.0} for _ in range(899)]
+        items.append({"rule_score": 0.8, "price": 100.0})
+
+        best_item = self.recommender._select_best_item_for_category(items, "top", {})
+
+        assert best_item is items[-1]
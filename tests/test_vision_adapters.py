@@ -9,6 +9,7 @@ import pytest
 import asyncio
 import sys
 from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
 
 # Add project root to Python path
 project_root = Path(__file__).parent.parent
@@ -29,10 +30,12 @@ class TestVisionAdapters:
         return MockVisionProvider()
 
     @pytest.fixture
-    def ollama_provider(self):
+    async def ollama_provider(self):
         """Ollama vision provider fixture."""
         # Use default Ollama URL
-        return VisionProviderOllama("http://localhost:11434/api")
+        provider = VisionProviderOllama("http://localhost:11434/api")
+        yield provider
+        await provider.close()
 
     @pytest.mark.asyncio
     async def test_mock_vision_provider_basic(self, mock_provider):
@@ -88,6 +91,17 @@ class TestVisionAdapters:
         assert isinstance(attrs.plus_size, bool)
         assert isinstance(attrs.description, str)
 
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("image_key", ["tshirt.jpg", "xl-dress.jpg", "unknown.jpg"])
+    async def test_trusted_vision_attributes_match_validated(self, mock_provider, image_key):
+        """Test that skipping validation for mock results builds the same attributes."""
+        assert mock_provider.trusted_results
+        test_result = await mock_provider.analyze_image(image_key)
+
+        trusted = VisionAttributes.from_provider(test_result, trusted=True)
+
+        assert trusted.model_dump() == VisionAttributes(**test_result).model_dump()
+
     @pytest.mark.asyncio
     async def test_mock_provider_structure(self, mock_provider):
         """Test that mock provider returns properly structured results."""
@@ -138,6 +152,23 @@ class TestVisionAdapters:
             ])
             assert has_expected_error, f"Unexpected error message: {str(e)}"
 
+    @pytest.mark.asyncio
+    async def test_ollama_provider_reuses_session(self):
+        """Test that every call goes through the one injected HTTP session."""
+        response = MagicMock(status=200)
+        response.json = AsyncMock(return_value={"color": "black", "category": "top"})
+        session = MagicMock(closed=False)
+        session.post.return_value.__aenter__.return_value = response
+
+        provider = VisionProviderOllama("http://sidecar", session=session)
+        results = await asyncio.gather(
+            *(provider.analyze_image(f"{i}.jpg") for i in range(3))
+        )
+
+        assert all(result["color"] == "black" for result in results)
+        assert session.post.call_count == 3
+        assert session.post.call_args.args == ("http://sidecar/analyze",)
+
     @pytest.mark.asyncio
     async def test_vision_attributes_edge_cases(self, mock_provider):
         """Test vision attributes with edge cases."""
@@ -0,0 +1,200 @@
+"""
+Vision Sidecar Tests
+
+Tests for the vision sidecar's /analyze cache, request coalescing and
+concurrent batch analysis, with the vision model replaced by a fake.
+"""
+
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+import vision_sidecar
+
+
+class FakeAnalyzer:
+    """Stand-in for VisionAnalyzer.analyze_product that records its calls."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = []
+        self.active = 0
+        self.peak = 0
+        self.fail = False
+        self.fallback = False
+        self._lock = threading.Lock()
+
+    def __call__(self, image_source):
+        with self._lock:
+            self.calls.append(image_source)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(self.delay)
+            if self.fail:
+                raise RuntimeError("model unavailable")
+            result = {"color": "black", "category": "top"}
+            if self.fallback:
+                result["fallback"] = True
+            return result
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+@pytest.fixture
+def fake_analyzer(monkeypatch):
+    """Fake vision model with the sidecar's cache and stats reset around it."""
+    fake = FakeAnalyzer()
+    monkeypatch.setattr(vision_sidecar.vision_analyzer, "analyze_product", fake)
+    vision_sidecar.analysis_cache.clear()
+    monkeypatch.setattr(
+        vision_sidecar, "analysis_cache_stats", {"hits": 0, "misses": 0, "coalesced": 0}
+    )
+    yield fake
+    vision_sidecar.analysis_cache.clear()
+
+
+@pytest.fixture(scope="module")
+async def sidecar_client():
+    """Async client for the sidecar app, so requests can be issued concurrently."""
+    async with AsyncClient(
+        transport=ASGITransport(app=vision_sidecar.app), base_url="http://test"
+    ) as async_client:
+        yield async_client
+
+
+async def _stats(client):
+    response = await client.get("/cache/stats")
+    return response.json()
+
+
+@pytest.mark.unit
+@pytest.mark.vision
+class TestAnalyzeCache:
+    """Test the /analyze response cache and request coalescing."""
+
+    async def test_repeat_image_is_served_from_cache(self, sidecar_client, fake_analyzer):
+        """Test that a second request for the same image skips the model."""
+        first = await sidecar_client.post("/analyze", json={"image_url": "https://x/a.jpg"})
+        second = await sidecar_client.post("/analyze", json={"image_url": "https://x/a.jpg"})
+
+        assert first.status_code == second.status_code == 200
+        assert first.json() == second.json()
+        assert first.json()["color"] == "black"
+        assert len(fake_analyzer.calls) == 1
+
+        stats = await _stats(sidecar_client)
+        assert (stats["hits"], stats["misses"], stats["size"]) == (1, 1, 1)
+
+    async def test_different_images_miss(self, sidecar_client, fake_analyzer):
+        """Test that distinct images are analyzed separately."""
+        for url in ("https://x/a.jpg", "https://x/b.jpg"):
+            response = await sidecar_client.post("/analyze", json={"image_url": url})
+            assert response.status_code == 200
+
+        assert fake_analyzer.calls == ["https://x/a.jpg", "https://x/b.jpg"]
+        assert (await _stats(sidecar_client))["misses"] == 2
+
+    async def test_concurrent_requests_share_one_analysis(self, sidecar_client, fake_analyzer):
+        """Test that concurrent misses for one image are coalesced."""
+        fake_analyzer.delay = 0.1
+
+        responses = await asyncio.gather(
+            *(
+                sidecar_client.post("/analyze", json={"image_url": "https://x/a.jpg"})
+                for _ in range(3)
+            )
+        )
+
+        assert [response.status_code for response in responses] == [200, 200, 200]
+        assert len(fake_analyzer.calls) == 1
+
+        stats = await _stats(sidecar_client)
+        assert (stats["misses"], stats["coalesced"]) == (1, 2)
+
+    async def test_failed_analysis_is_not_cached(self, sidecar_client, fake_analyzer):
+        """Test that an analysis error is reported and retried on the next request."""
+        fake_analyzer.fail = True
+        response = await sidecar_client.post("/analyze", json={"image_url": "https://x/a.jpg"})
+        assert response.status_code == 500
+
+        fake_analyzer.fail = False
+        response = await sidecar_client.post("/analyze", json={"image_url": "https://x/a.jpg"})
+        assert response.status_code == 200
+        assert len(fake_analyzer.calls) == 2
+
+    async def test_fallback_analysis_is_not_cached(self, sidecar_client, fake_analyzer):
+        """Test that a placeholder from an unparseable reply is returned but not cached."""
+        fake_analyzer.fallback = True
+        response = await sidecar_client.post("/analyze", json={"image_url": "https://x/a.jpg"})
+        assert response.status_code == 200
+        assert (await _stats(sidecar_client))["size"] == 0
+
+        fake_analyzer.fallback = False
+        await sidecar_client.post("/analyze", json={"image_url": "https://x/a.jpg"})
+        assert len(fake_analyzer.calls) == 2
+
+
+@pytest.mark.unit
+@pytest.mark.vision
+class TestBatchAnalyze:
+    """Test concurrent, NDJSON-streamed /batch-analyze."""
+
+    async def test_batch_runs_concurrently_within_limit(self, sidecar_client, fake_analyzer):
+        """Test that batch images are analyzed in parallel, capped by the semaphore."""
+        fake_analyzer.delay = 0.05
+        count = vision_sidecar.VISION_CONCURRENCY * 2
+
+        response = await sidecar_client.post(
+            "/batch-analyze",
+            json=[{"image_url": f"https://x/{i}.jpg"} for i in range(count)],
+        )
+
+        assert response.status_code == 200
+        assert len(fake_analyzer.calls) == count
+        assert 1 < fake_analyzer.peak <= vision_sidecar.VISION_CONCURRENCY
+
+    async def test_batch_streams_index_tagged_ndjson(self, sidecar_client, fake_analyzer):
+        """Test that each result, success or error, is one NDJSON line with its index."""
+        response = await sidecar_client.post(
+            "/batch-analyze",
+            json=[{"image_url": "https://x/0.jpg"}, {}, {"image_url": "https://x/2.jpg"}],
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+
+        records = [json.loads(line) for line in response.text.splitlines()]
+        by_index = {record["index"]: record for record in records}
+        assert sorted(by_index) == [0, 1, 2]
+        assert by_index[0]["color"] == "black"
+        assert by_index[2]["category"] == "top"
+        assert by_index[1] == {"error": "No image source provided", "index": 1}
+
+    async def test_batch_reports_analysis_errors_inline(self, sidecar_client, fake_analyzer):
+        """Test that a failing image yields an error record instead of failing the batch."""
+        fake_analyzer.fail = True
+
+        response = await sidecar_client.post(
+            "/batch-analyze", json=[{"image_url": "https://x/0.jpg"}]
+        )
+
+        assert response.status_code == 200
+        assert json.loads(response.text) == {"error": "model unavailable", "index": 0}
+
+    async def test_unconsumed_stream_starts_no_analyses(self, fake_analyzer):
+        """Test that analyses start only when the response body is streamed."""
+        response = await vision_sidecar.batch_analyze_images(
+            [vision_sidecar.ImageAnalysisRequest(image_url="https://x/0.jpg")]
+        )
+        await asyncio.sleep(0.05)
+        assert fake_analyzer.calls == []
+
+        body = [chunk async for chunk in response.body_iterator]
+        assert json.loads(body[0])["index"] == 0
+        assert fake_analyzer.calls == ["https://x/0.jpg"]
@@ -5,12 +5,19 @@ FastAPI service that wraps VisionAnalyzer as an HTTP endpoint.
 This runs as a separate service that can be scaled independently.
 """
 
+import asyncio
+import base64
+import hashlib
 import os
 import logging
+from collections import OrderedDict
 from fastapi import FastAPI, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from pydantic import BaseModel
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Union
+import orjson
+import requests
 import uvicorn
 import structlog
 
@@ -24,6 +31,7 @@ app = FastAPI(
     title="Vision Sidecar",
     description="Vision analysis service for fashion product images",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
 )
 
 # Add CORS middleware
@@ -36,12 +44,41 @@ app.add_middleware(
     expose_headers=["*"],
 )
 
+# Cap on analyses in flight at once, sized to what the vision model can serve
+VISION_CONCURRENCY = int(os.getenv("VISION_CONCURRENCY", "4"))
+analysis_semaphore = asyncio.Semaphore(VISION_CONCURRENCY)
+
+# Keep-alive connections to Ollama, one per concurrent analysis
+vision_session = requests.Session()
+vision_session.mount(
+    "http://", requests.adapters.HTTPAdapter(pool_maxsize=VISION_CONCURRENCY)
+)
+vision_session.mount(
+    "https://", requests.adapters.HTTPAdapter(pool_maxsize=VISION_CONCURRENCY)
+)
+
 # Initialize vision analyzer
 vision_analyzer = VisionAnalyzer(
     model=os.getenv("OLLAMA_VISION_MODEL", "qwen2.5vl"),
     save_processed=False,  # Don't save processed images in sidecar
+    session=vision_session,
 )
 
+# LRU cache of JSON-encoded /analyze responses keyed by SHA-256 of the image source
+ANALYSIS_CACHE_SIZE = int(os.getenv("VISION_CACHE_SIZE", "4096"))
+analysis_cache: "OrderedDict[str, bytes]" = OrderedDict()
+analysis_cache_stats = {"hits": 0, "misses": 0, "coalesced": 0}
+
+# Analyses currently running, keyed like the cache
+analysis_inflight: Dict[str, "asyncio.Task[bytes]"] = {}
+
+
+def image_cache_key(image_source: Union[str, bytes]) -> str:
+    """Hash an image URL or raw image bytes into a cache key."""
+    if isinstance(image_source, str):
+        image_source = image_source.encode()
+    return hashlib.sha256(image_source).hexdigest()
+
 
 class ImageAnalysisRequest(BaseModel):
     """Request model for image analysis."""
@@ -67,6 +104,50 @@ class ImageAnalysisResponse(BaseModel):
     request_id: Optional[str] = None
 
 
+async def _analyze_and_cache(
+    cache_key: str, image_source: Union[str, bytes]
+) -> bytes:
+    """Run the vision model on one image and cache the encoded response."""
+    # The analyzer blocks on HTTP to the model, so run it off the loop
+    async with analysis_semaphore:
+        result = await asyncio.to_thread(vision_analyzer.analyze_product, image_source)
+
+    # Map to response model
+    response = ImageAnalysisResponse(
+        color=result.get("color", "unknown"),
+        category=result.get("category", "unknown"),
+        material=result.get("material", "unknown"),
+        pattern=result.get("pattern", "unknown"),
+        style=result.get("style", "unknown"),
+        season=result.get("season", "unknown"),
+        occasion=result.get("occasion", "unknown"),
+        fit=result.get("fit", "unknown"),
+        plus_size=result.get("plus_size", False),
+        description=result.get("description", "No description available"),
+    )
+
+    # Encode once; returning the bytes as a Response also skips FastAPI
+    # re-validating the model against response_model on every hit
+    body = response.model_dump_json().encode()
+
+    # A placeholder from an unparseable model reply must not stick to the image
+    if result.get("fallback"):
+        logger.warning("Image analysis fell back to defaults", cache_key=cache_key)
+    else:
+        analysis_cache[cache_key] = body
+        if len(analysis_cache) > ANALYSIS_CACHE_SIZE:
+            analysis_cache.popitem(last=False)
+
+    logger.info("Image analysis completed", result=result)
+    return body
+
+
+@app.on_event("shutdown")
+async def close_vision_session():
+    """Release pooled connections to Ollama."""
+    vision_analyzer.close()
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
@@ -92,8 +173,6 @@ async def analyze_image(request: ImageAnalysisRequest):
         if request.image_url:
             image_source = request.image_url
         elif request.image_bytes:
-            import base64
-
             image_source = base64.b64decode(request.image_bytes)
         elif request.image_key:
             # In a real implementation, this would fetch from S3
@@ -102,72 +181,101 @@ async def analyze_image(request: ImageAnalysisRequest):
         else:
             raise HTTPException(status_code=400, detail="No image source provided")
 
-        # Analyze the image
-        result = vision_analyzer.analyze_product(image_source)
-
-        # Map to response model
-        response = ImageAnalysisResponse(
-            color=result.get("color", "unknown"),
-            category=result.get("category", "unknown"),
-            material=result.get("material", "unknown"),
-            pattern=result.get("pattern", "unknown"),
-            style=result.get("style", "unknown"),
-            season=result.get("season", "unknown"),
-            occasion=result.get("occasion", "unknown"),
-            fit=result.get("fit", "unknown"),
-            plus_size=result.get("plus_size", False),
-            description=result.get("description", "No description available"),
-        )
-
-        logger.info("Image analysis completed", result=result)
-        return response
+        # Identical images skip the model entirely
+        cache_key = image_cache_key(image_source)
+        cached = analysis_cache.get(cache_key)
+        if cached is not None:
+            analysis_cache.move_to_end(cache_key)
+            analysis_cache_stats["hits"] += 1
+            logger.info("Image analysis served from cache", cache_key=cache_key)
+            return Response(cached, media_type="application/json")
+
+        # Concurrent requests for the same image share one analysis
+        task = analysis_inflight.get(cache_key)
+        if task is None:
+            analysis_cache_stats["misses"] += 1
+            task = asyncio.create_task(_analyze_and_cache(cache_key, image_source))
+            analysis_inflight[cache_key] = task
+            task.add_done_callback(lambda _: analysis_inflight.pop(cache_key, None))
+        else:
+            analysis_cache_stats["coalesced"] += 1
+
+        # Shield so one caller disconnecting does not cancel it for the others
+        body = await asyncio.shield(task)
+        return Response(body, media_type="application/json")
 
     except Exception as e:
         logger.error("Error analyzing image", error=str(e))
         raise HTTPException(status_code=500, detail=f"Image analysis failed: {str(e)}")
 
 
+@app.get("/cache/stats")
+async def cache_stats():
+    """Report /analyze response cache usage."""
+    return {
+        "size": len(analysis_cache),
+        "maxsize": ANALYSIS_CACHE_SIZE,
+        **analysis_cache_stats,
+    }
+
+
 @app.post("/batch-analyze")
-async def batch_analyze_images(requests: list[ImageAnalysisRequest]):
+async def batch_analyze_images(image_requests: list[ImageAnalysisRequest]):
     """
     Analyze multiple images in batch.
 
     Args:
-        requests: List of image analysis requests
+        image_requests: List of image analysis requests
 
     Returns:
-        List of image analysis responses
+        NDJSON stream with one analysis result per line, in completion order;
+        each record carries the "index" of its request
     """
     try:
-        logger.info("Starting batch image analysis", count=len(requests))
+        logger.info("Starting batch image analysis", count=len(image_requests))
 
-        results = []
-        for i, req in enumerate(requests):
+        async def analyze_one(i: int, req: ImageAnalysisRequest) -> Dict[str, Any]:
             try:
                 # Process each request
                 image_source = None
                 if req.image_url:
                     image_source = req.image_url
                 elif req.image_bytes:
-                    import base64
-
                     image_source = base64.b64decode(req.image_bytes)
                 elif req.image_key:
                     image_source = f"https://example.com/images/{req.image_key}"
                 else:
-                    results.append({"error": "No image source provided", "index": i})
-                    continue
+                    return {"error": "No image source provided", "index": i}
 
-                # Analyze the image
-                result = vision_analyzer.analyze_product(image_source)
-                results.append(result)
+                # The analyzer blocks on HTTP to the model, so run it off the loop
+                async with analysis_semaphore:
+                    result = await asyncio.to_thread(
+                        vision_analyzer.analyze_product, image_source
+                    )
+                return {**result, "index": i}
 
             except Exception as e:
                 logger.error(f"Error analyzing image {i}", error=str(e))
-                results.append({"error": str(e), "index": i})
-
-        logger.info("Batch image analysis completed", processed=len(results))
-        return results
+                return {"error": str(e), "index": i}
+
+        async def stream_results():
+            # Start the analyses only once the response is being streamed, so an
+            # unconsumed stream leaves nothing running or holding the semaphore
+            tasks = [
+                asyncio.ensure_future(analyze_one(i, req))
+                for i, req in enumerate(image_requests)
+            ]
+            try:
+                # Emit each result as soon as it is ready
+                for next_result in asyncio.as_completed(tasks):
+                    yield orjson.dumps(await next_result) + b"\n"
+                logger.info("Batch image analysis completed", processed=len(tasks))
+            finally:
+                # A disconnected client stops the remaining analyses
+                for task in tasks:
+                    task.cancel()
+
+        return StreamingResponse(stream_results(), media_type="application/x-ndjson")
 
     except Exception as e:
         logger.error("Error in batch analysis", error=str(e))